@@ -1,26 +1,79 @@
 # /config/custom_components/akubox_controller/__init__.py
 import logging
+from datetime import timedelta
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN, PLATFORMS, CONF_HOST
-from .api import AkuBoxApiClient, AkuBoxApiConnectionError, AkuBoxApiAuthError
+from .const import (
+    DOMAIN,
+    PLATFORMS,
+    CONF_HOST,
+    UPDATE_INTERVAL_SYSTEM,
+    UPDATE_INTERVAL_VOLUME,
+    UPDATE_INTERVAL_SWITCH,
+    CONF_SCAN_INTERVAL_SYSTEM,
+    CONF_SCAN_INTERVAL_VOLUME,
+    CONF_SCAN_INTERVAL_SWITCH,
+    CONF_STALE_GRACE,
+    DEFAULT_STALE_GRACE,
+    CONF_GAUGE_CHANGE_EVENTS,
+    DEFAULT_GAUGE_CHANGE_EVENTS,
+    CONF_GOROUTINE_CHANGE_THRESHOLD,
+    DEFAULT_GOROUTINE_CHANGE_THRESHOLD,
+    MEDIA_PLAYER_VOLUME,
+    SWITCHES,
+    CAP_BATTERY,
+    CAP_VOLUME,
+    BATTERY_SENSORS,
+    EVENT_FIRMWARE_CHANGED,
+    SIGNAL_ENTRY_SETUP,
+)
+from .api import AkuBoxApiClient, AkuBoxApiError, AkuBoxApiConnectionError, AkuBoxApiAuthError
+from .capabilities import async_get_capabilities, async_remove_capabilities
+from .coordinator import AkuBoxDataUpdateCoordinator, async_entity_enabled
+from .entity import build_device_info
+from .sensor import SENSOR_DESCRIPTIONS
+from .metrics import AkuBoxMetricsView
+from .services import async_setup_services
+from .websocket_api import async_register_websocket_commands
 
 _LOGGER = logging.getLogger(__name__)
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+# hass.data key of each coordinator -> (option key, default interval in seconds)
+COORDINATOR_INTERVALS = {
+    "system_coordinator": (CONF_SCAN_INTERVAL_SYSTEM, UPDATE_INTERVAL_SYSTEM),
+    "volume_coordinator": (CONF_SCAN_INTERVAL_VOLUME, UPDATE_INTERVAL_VOLUME),
+    "switch_coordinator": (CONF_SCAN_INTERVAL_SWITCH, UPDATE_INTERVAL_SWITCH),
+}
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up integration-wide resources shared by all AkuBox entries."""
+    hass.data.setdefault(DOMAIN, {})
+    hass.http.register_view(AkuBoxMetricsView(hass))
+    async_setup_services(hass)
+    async_register_websocket_commands(hass)
+    return True
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up AkuBox Controller from a config entry."""
     hass.data.setdefault(DOMAIN, {})
     host = entry.data[CONF_HOST]
 
     session = async_get_clientsession(hass)
-    client = AkuBoxApiClient(host, session)
+    client = AkuBoxApiClient(host, session, hedge_requests=True)
 
     try:
-        if not await client.test_connection():
-            raise ConfigEntryNotReady(f"Cannot connect to AkuBox at {host}")
+        system_info = await client.get_system_info()
         _LOGGER.info("Successfully connected to AkuBox at %s", host)
     except AkuBoxApiConnectionError as err:
         _LOGGER.error("Failed to connect to AkuBox at %s: %s", host, err)
@@ -28,17 +81,94 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     except AkuBoxApiAuthError as err:
         _LOGGER.error("Authentication error for AkuBox at %s: %s", host, err)
         raise ConfigEntryNotReady(f"Authentication error for AkuBox at {host}: {err}") from err
+    except AkuBoxApiError as err:
+        raise ConfigEntryNotReady(f"Cannot connect to AkuBox at {host}: {err}") from err
 
+    # Entities and pollers are only created for what this device (firmware) supports
+    capabilities = await async_get_capabilities(hass, entry, client, system_info)
+
+    stale_grace = entry.options.get(CONF_STALE_GRACE, DEFAULT_STALE_GRACE)
+
+    system_coordinator = AkuBoxDataUpdateCoordinator(
+        hass,
+        entry,
+        name=f"{entry.title} System Info",
+        update_method=client.get_system_info,
+        update_interval=timedelta(seconds=entry.options.get(CONF_SCAN_INTERVAL_SYSTEM, UPDATE_INTERVAL_SYSTEM)),
+        platform="sensor",
+        entity_keys={
+            description.key: description.entity_registry_enabled_default
+            for description in SENSOR_DESCRIPTIONS
+            if capabilities[CAP_BATTERY] or description.key not in BATTERY_SENSORS
+        },
+        stale_grace=stale_grace,
+        gauge_change_events=entry.options.get(CONF_GAUGE_CHANGE_EVENTS, DEFAULT_GAUGE_CHANGE_EVENTS),
+        goroutine_change_threshold=entry.options.get(
+            CONF_GOROUTINE_CHANGE_THRESHOLD, DEFAULT_GOROUTINE_CHANGE_THRESHOLD
+        ),
+    )
+    volume_coordinator = None
+    if capabilities[CAP_VOLUME]:
+        volume_coordinator = AkuBoxDataUpdateCoordinator(
+            hass,
+            entry,
+            name=f"{entry.title} Volume",
+            update_method=client.get_volume,
+            update_interval=timedelta(seconds=entry.options.get(CONF_SCAN_INTERVAL_VOLUME, UPDATE_INTERVAL_VOLUME)),
+            platform="media_player",
+            entity_keys={MEDIA_PLAYER_VOLUME: True},
+            stale_grace=stale_grace,
+        )
+    supported_switches = [switch_type for switch_type in SWITCHES if capabilities[switch_type]]
+    # Only poll the switch endpoints that back an enabled switch
+    enabled_switches = [
+        switch_type for switch_type in supported_switches
+        if async_entity_enabled(hass, entry, "switch", switch_type)
+    ]
+    switch_coordinator = None
+    if supported_switches:
+        switch_coordinator = AkuBoxDataUpdateCoordinator(
+            hass,
+            entry,
+            name=f"{entry.title} Switches",
+            update_method=lambda: client.get_switch_states(enabled_switches),
+            update_interval=timedelta(seconds=entry.options.get(CONF_SCAN_INTERVAL_SWITCH, UPDATE_INTERVAL_SWITCH)),
+            platform="switch",
+            entity_keys={switch_type: True for switch_type in supported_switches},
+            stale_grace=stale_grace,
+        )
+    # Only the system info read gates setup; a failing volume or switch endpoint
+    # just makes its own entities unavailable
+    await system_coordinator.async_setup()
+    for coordinator in (volume_coordinator, switch_coordinator):
+        if coordinator is not None:
+            await coordinator.async_setup(required=False)
 
     hass.data[DOMAIN][entry.entry_id] = {
         "client": client,
-        "host": host
+        "host": host,
+        "capabilities": capabilities,
+        # One DeviceInfo for all entities; a firmware change reloads the entry, which rebuilds it
+        "device_info": build_device_info(entry, system_info),
+        "system_coordinator": system_coordinator,
+        "volume_coordinator": volume_coordinator,
+        "switch_coordinator": switch_coordinator,
     }
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     entry.async_on_unload(entry.add_update_listener(update_listener))
 
+    @callback
+    def _async_firmware_changed(event: Event) -> None:
+        if event.data["entry_id"] == entry.entry_id:
+            _LOGGER.info("Firmware of %s changed, reloading to probe its capabilities again", entry.title)
+            hass.async_create_task(hass.config_entries.async_reload(entry.entry_id))
+
+    entry.async_on_unload(hass.bus.async_listen(EVENT_FIRMWARE_CHANGED, _async_firmware_changed))
+
+    # Live metrics subscriptions re-attach to the new coordinators after a reload
+    async_dispatcher_send(hass, SIGNAL_ENTRY_SETUP, entry.entry_id)
     return True
 
 
@@ -51,7 +181,29 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     return unload_ok
 
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Drop the cached capabilities of a deleted entry."""
+    await async_remove_capabilities(hass, entry.entry_id)
+
 async def update_listener(hass: HomeAssistant, entry: ConfigEntry):
-   """Handle options update."""
-   _LOGGER.info("Configuration options updated for %s, reloading integration to apply changes.", entry.title)
-   await hass.config_entries.async_reload(entry.entry_id)
\ No newline at end of file
+    """Apply option changes in place; only a changed host needs a full reload."""
+    akubox_data = hass.data[DOMAIN][entry.entry_id]
+    if entry.data[CONF_HOST] != akubox_data["host"]:
+        _LOGGER.info("Host changed for %s, reloading integration to apply changes.", entry.title)
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    for coordinator_key, (option_key, default_interval) in COORDINATOR_INTERVALS.items():
+        coordinator: AkuBoxDataUpdateCoordinator | None = akubox_data[coordinator_key]
+        if coordinator is None:
+            continue
+        coordinator.async_set_update_interval(entry.options.get(option_key, default_interval))
+        coordinator.async_set_stale_grace(entry.options.get(CONF_STALE_GRACE, DEFAULT_STALE_GRACE))
+    akubox_data["system_coordinator"].async_set_gauge_change_events(
+        entry.options.get(CONF_GAUGE_CHANGE_EVENTS, DEFAULT_GAUGE_CHANGE_EVENTS)
+    )
+    akubox_data["system_coordinator"].async_set_goroutine_change_threshold(
+        entry.options.get(CONF_GOROUTINE_CHANGE_THRESHOLD, DEFAULT_GOROUTINE_CHANGE_THRESHOLD)
+    )
+    _LOGGER.info("Configuration options updated for %s, applied without reload.", entry.title)
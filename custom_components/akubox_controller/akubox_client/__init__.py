@@ -0,0 +1,31 @@
+# /config/custom_components/akubox_controller/akubox_client/__init__.py
+"""Async client for the AkuBox local API, usable with or without Home Assistant."""
+from .client import (
+    AkuBoxApiClient,
+    AkuBoxApiError,
+    AkuBoxApiConnectionError,
+    AkuBoxApiTimeoutError,
+    AkuBoxApiDisconnectedError,
+    AkuBoxApiConnectionRefusedError,
+    AkuBoxApiNotFoundError,
+    AkuBoxApiAuthError,
+    RttEstimator,
+    DEVICE_VOLUME_MAX,
+    REQUEST_TIMEOUT,
+    WRITE_TIMEOUT,
+)
+
+__all__ = [
+    "AkuBoxApiClient",
+    "AkuBoxApiError",
+    "AkuBoxApiConnectionError",
+    "AkuBoxApiTimeoutError",
+    "AkuBoxApiDisconnectedError",
+    "AkuBoxApiConnectionRefusedError",
+    "AkuBoxApiNotFoundError",
+    "AkuBoxApiAuthError",
+    "RttEstimator",
+    "DEVICE_VOLUME_MAX",
+    "REQUEST_TIMEOUT",
+    "WRITE_TIMEOUT",
+]
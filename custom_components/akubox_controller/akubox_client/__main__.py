@@ -0,0 +1,6 @@
+# /config/custom_components/akubox_controller/akubox_client/__main__.py
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,228 @@
+# /config/custom_components/akubox_controller/akubox_client/cli.py
+"""Headless AkuBox poller.
+
+    python -m akubox_client poll 192.168.1.20 192.168.1.21 --interval 10
+    python -m akubox_client health --file hosts.txt
+    python -m akubox_client bench 192.168.1.20 --requests 200 --concurrency 8
+
+Every command prints one JSON object per line (NDJSON).
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import sys
+import time
+from typing import Any
+
+import aiohttp
+
+from .client import AkuBoxApiClient, AkuBoxApiError
+
+DEFAULT_CONCURRENCY = 32
+
+BENCH_ENDPOINTS = {
+    "system": AkuBoxApiClient.get_system_info,
+    "volume": AkuBoxApiClient.get_volume,
+    "dlna": AkuBoxApiClient.get_dlna_state,
+    "led": AkuBoxApiClient.get_led_logo_state,
+}
+
+
+def _emit(record: dict[str, Any]) -> None:
+    sys.stdout.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+    sys.stdout.flush()
+
+
+def _percentile(ordered: list[float], percentile: float) -> float | None:
+    if not ordered:
+        return None
+    return ordered[max(0, math.ceil(percentile * len(ordered)) - 1)]
+
+
+async def _poll_once(client: AkuBoxApiClient) -> dict[str, Any]:
+    """Take one snapshot of a device; failed sections are reported, not fatal."""
+    start = time.monotonic()
+    system_info, volume, dlna, led = await asyncio.gather(
+        client.get_system_info(),
+        client.get_volume(),
+        client.get_dlna_state(),
+        client.get_led_logo_state(),
+        return_exceptions=True,
+    )
+    record: dict[str, Any] = {
+        "ts": time.time(),
+        "host": client.host,
+        "latency_ms": round((time.monotonic() - start) * 1000, 1),
+    }
+    errors = {}
+    for key, value in (("system", system_info), ("volume", volume), ("dlna", dlna), ("led_logo", led)):
+        if isinstance(value, Exception):
+            errors[key] = str(value)
+        elif key == "volume":
+            record[key] = value.get("volume")
+        else:
+            record[key] = value
+    record["ok"] = not errors
+    if errors:
+        record["errors"] = errors
+    return record
+
+
+async def _cmd_poll(clients: list[AkuBoxApiClient], args: argparse.Namespace) -> int:
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def _limited(client: AkuBoxApiClient) -> dict[str, Any]:
+        async with semaphore:
+            return await _poll_once(client)
+
+    round_number = 0
+    while True:
+        started = time.monotonic()
+        for task in asyncio.as_completed([_limited(client) for client in clients]):
+            _emit(await task)
+        round_number += 1
+        if args.count and round_number >= args.count:
+            return 0
+        await asyncio.sleep(max(0.0, args.interval - (time.monotonic() - started)))
+
+
+async def _health_check(client: AkuBoxApiClient) -> dict[str, Any]:
+    record: dict[str, Any] = {"host": client.host}
+    start = time.monotonic()
+    system_info, switch_state = await asyncio.gather(
+        client.get_system_info(), client.get_dlna_state(), return_exceptions=True
+    )
+    record["latency_ms"] = round((time.monotonic() - start) * 1000, 1)
+    record["port_80"] = not isinstance(system_info, Exception)
+    record["port_2268"] = not isinstance(switch_state, Exception)
+    if record["port_80"]:
+        system = system_info.get("system") or {}
+        record["hostname"] = system.get("hostname")
+        record["go_version"] = system.get("go_version")
+        record["start_time"] = system.get("start_time")
+    else:
+        record["error"] = str(system_info)
+    record["ok"] = record["port_80"] and record["port_2268"]
+    return record
+
+
+async def _cmd_health(clients: list[AkuBoxApiClient], args: argparse.Namespace) -> int:
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def _limited(client: AkuBoxApiClient) -> dict[str, Any]:
+        async with semaphore:
+            return await _health_check(client)
+
+    healthy = True
+    for task in asyncio.as_completed([_limited(client) for client in clients]):
+        record = await task
+        healthy = healthy and record["ok"]
+        _emit(record)
+    return 0 if healthy else 1
+
+
+async def _bench(client: AkuBoxApiClient, args: argparse.Namespace) -> dict[str, Any]:
+    method = BENCH_ENDPOINTS[args.endpoint]
+    latencies: list[float] = []
+    errors = 0
+    remaining = args.requests
+
+    async def _worker() -> None:
+        nonlocal errors, remaining
+        while remaining > 0:
+            remaining -= 1
+            start = time.monotonic()
+            try:
+                await method(client)
+            except AkuBoxApiError:
+                errors += 1
+            else:
+                latencies.append(time.monotonic() - start)
+
+    start = time.monotonic()
+    await asyncio.gather(*(_worker() for _ in range(args.concurrency)))
+    duration = time.monotonic() - start
+    ordered = sorted(latencies)
+    return {
+        "host": client.host,
+        "endpoint": args.endpoint,
+        "requests": args.requests,
+        "errors": errors,
+        "duration_s": round(duration, 3),
+        "rps": round(args.requests / duration, 1) if duration else None,
+        **{
+            f"p{int(p * 100)}_ms": round(value * 1000, 2) if (value := _percentile(ordered, p)) is not None else None
+            for p in (0.5, 0.95, 0.99)
+        },
+        "stats": client.request_stats,
+    }
+
+
+async def _cmd_bench(clients: list[AkuBoxApiClient], args: argparse.Namespace) -> int:
+    # Devices are benchmarked one after another so they do not compete for the local link
+    for client in clients:
+        _emit(await _bench(client, args))
+    return 0
+
+
+COMMANDS = {"poll": _cmd_poll, "health": _cmd_health, "bench": _cmd_bench}
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="akubox", description="Poll and profile AkuBox devices.")
+    parser.add_argument("-v", "--verbose", action="store_true", help="enable debug logging")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def _add_hosts(subparser: argparse.ArgumentParser) -> None:
+        subparser.add_argument("hosts", nargs="*", help="device hosts or IP addresses")
+        subparser.add_argument("-f", "--file", help="file with one host per line ('-' for stdin)")
+        subparser.add_argument("--hedge", action="store_true", help="hedge slow GETs with a second request")
+
+    poll = subparsers.add_parser("poll", help="poll devices and print NDJSON snapshots")
+    _add_hosts(poll)
+    poll.add_argument("-i", "--interval", type=float, default=10, help="seconds between rounds")
+    poll.add_argument("-n", "--count", type=int, default=0, help="number of rounds (0 = forever)")
+    poll.add_argument("-c", "--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+
+    health = subparsers.add_parser("health", help="one-shot health sweep, exit 1 if any device is unhealthy")
+    _add_hosts(health)
+    health.add_argument("-c", "--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+
+    bench = subparsers.add_parser("bench", help="measure request throughput and latency per device")
+    _add_hosts(bench)
+    bench.add_argument("-e", "--endpoint", choices=sorted(BENCH_ENDPOINTS), default="system")
+    bench.add_argument("-r", "--requests", type=int, default=100)
+    bench.add_argument("-c", "--concurrency", type=int, default=4)
+
+    args = parser.parse_args(argv)
+    hosts = list(args.hosts)
+    if args.file:
+        with (sys.stdin if args.file == "-" else open(args.file, encoding="utf-8")) as hosts_file:
+            hosts.extend(line.split("#", 1)[0].strip() for line in hosts_file)
+    args.hosts = list(dict.fromkeys(host for host in hosts if host))
+    if not args.hosts:
+        parser.error("no hosts given")
+    return args
+
+
+async def _async_main(args: argparse.Namespace) -> int:
+    connector = aiohttp.TCPConnector(limit=max(args.concurrency, len(args.hosts)))
+    async with aiohttp.ClientSession(connector=connector) as session:
+        clients = [AkuBoxApiClient(host, session, hedge_requests=args.hedge) for host in args.hosts]
+        return await COMMANDS[args.command](clients, args)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the CLI."""
+    args = _parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING, stream=sys.stderr)
+    try:
+        return asyncio.run(_async_main(args))
+    except KeyboardInterrupt:
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,519 @@
+# /config/custom_components/akubox_controller/akubox_client/client.py
+# Only depends on aiohttp so it can be used without Home Assistant (see cli.py)
+import asyncio
+import aiohttp
+import json
+import logging
+import math
+import random
+from collections import Counter, deque
+from typing import Any, Awaitable, Callable, NoReturn
+
+from .const import (
+    API_SYSTEM_INFO,
+    API_VOLUME_GET,
+    API_VOLUME_SET,
+    API_DLNA_STATE,     # 使用修改后的常量名
+    API_LED_LOGO_STATE, # 使用修改后的常量名
+    API_PORT_SWITCHES,
+    SWITCH_DLNA,
+    SWITCH_LED_LOGO,
+)
+
+_LOGGER = logging.getLogger(__name__)
+REQUEST_TIMEOUT = 10 # seconds, used until a port has RTT samples
+# POSTs are not retried and some take the device a while (e.g. toggling the DLNA renderer),
+# so they never get less than this, however fast the GETs on that port are
+WRITE_TIMEOUT = REQUEST_TIMEOUT # seconds
+DEVICE_VOLUME_MAX = 63
+
+# Adaptive timeouts (RFC 6298 style RTO estimator, tracked per device and port)
+TIMEOUT_MIN = 0.5 # seconds
+TIMEOUT_MAX = 30 # seconds, leaves room for a box that is still booting
+RTT_ALPHA = 1 / 8
+RTT_BETA = 1 / 4
+RTT_VARIANCE_FACTOR = 4
+
+# Retry policy for idempotent GETs (POSTs are never retried)
+RETRY_BACKOFF_BASE = 0.2 # seconds
+RETRY_BACKOFF_MAX = 2 # seconds
+RETRY_DEADLINE = REQUEST_TIMEOUT # overall budget for one GET including retries
+
+# Hedged GETs: fire a second request once the first is slower than the observed p95
+HEDGE_LATENCY_PERCENTILE = 0.95
+HEDGE_MIN_SAMPLES = 20
+LATENCY_WINDOW = 100
+
+# Response bodies are streamed into a bounded buffer; anything larger is rejected unread
+RESPONSE_MAX_SIZE = 64 * 1024 # bytes, endpoints not listed below
+RESPONSE_MAX_SIZES = {
+    API_SYSTEM_INFO: 64 * 1024,
+    API_VOLUME_GET: 1024,
+    API_VOLUME_SET: 1024,
+    API_DLNA_STATE: 64, # "on" / "off"
+    API_LED_LOGO_STATE: 64,
+}
+READ_CHUNK_SIZE = 4096
+LOG_BODY_MAX = 200 # characters of a body that end up in a log line
+
+class AkuBoxApiError(Exception):
+    """Base exception for API errors."""
+    pass
+
+class AkuBoxApiConnectionError(AkuBoxApiError):
+    """Exception for connection errors."""
+    pass
+
+class AkuBoxApiTimeoutError(AkuBoxApiConnectionError):
+    """Exception for requests that got no response in time (unlike a refused connection)."""
+    pass
+
+class AkuBoxApiDisconnectedError(AkuBoxApiConnectionError):
+    """Exception for a connection the device closed before answering."""
+    pass
+
+class AkuBoxApiConnectionRefusedError(AkuBoxApiConnectionError):
+    """Exception for a port the device actively refused, i.e. nothing listens on it."""
+    pass
+
+class AkuBoxApiNotFoundError(AkuBoxApiError):
+    """Exception for an endpoint the device answered with 404."""
+    pass
+
+class AkuBoxApiAuthError(AkuBoxApiError):
+    """Exception for authentication errors (if any in future)."""
+    pass
+
+
+class RttEstimator:
+    """Smoothed round-trip time and variance used to derive request timeouts."""
+
+    def __init__(self, min_timeout: float = TIMEOUT_MIN, max_timeout: float = TIMEOUT_MAX):
+        """Initialize the estimator with the conservative default timeout."""
+        self._min_timeout = min_timeout
+        self._max_timeout = max_timeout
+        self.srtt: float | None = None
+        self.rttvar: float | None = None
+        self._timeout = self._clamp(REQUEST_TIMEOUT)
+
+    def _clamp(self, value: float) -> float:
+        return max(self._min_timeout, min(self._max_timeout, value))
+
+    @property
+    def timeout(self) -> float:
+        """Return the current request timeout in seconds."""
+        return self._timeout
+
+    def add_sample(self, rtt: float) -> None:
+        """Fold a measured round-trip time into the estimate."""
+        if self.srtt is None or self.rttvar is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = (1 - RTT_BETA) * self.rttvar + RTT_BETA * abs(self.srtt - rtt)
+            self.srtt = (1 - RTT_ALPHA) * self.srtt + RTT_ALPHA * rtt
+        self._timeout = self._clamp(self.srtt + RTT_VARIANCE_FACTOR * self.rttvar)
+
+    def backoff(self) -> None:
+        """Double the timeout after a request timed out (Karn's algorithm)."""
+        self._timeout = self._clamp(self._timeout * 2)
+
+
+class AkuBoxApiClient:
+    """Client to interact with the AkuBox API."""
+
+    def __init__(
+        self,
+        host: str,
+        session: aiohttp.ClientSession | None = None,
+        hedge_requests: bool = False,
+        retry_deadline: float = RETRY_DEADLINE,
+        min_timeout: float = TIMEOUT_MIN,
+        max_timeout: float = TIMEOUT_MAX,
+        write_timeout: float = WRITE_TIMEOUT,
+    ):
+        """Initialize the API client.
+
+        Without a session the client creates its own on first use; close it with
+        close() or by using the client as an async context manager.
+        """
+        self._host = host
+        self._session = session
+        self._owns_session = session is None
+        self._base_url = f"http://{self._host}"
+        self._switch_base_url = f"http://{self._host}:{API_PORT_SWITCHES}"
+        self._hedge_requests = hedge_requests
+        self._retry_deadline = retry_deadline
+        self._min_timeout = min_timeout
+        self._max_timeout = max_timeout
+        self._write_timeout = write_timeout
+        self._latencies: dict[str, deque[float]] = {}
+        self._rtt_estimators: dict[str, RttEstimator] = {}
+        self._stats: Counter[str] = Counter()
+
+    async def __aenter__(self) -> "AkuBoxApiClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the session if the client created it."""
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+        return self._session
+
+    def _rtt_estimator(self, base_url: str) -> RttEstimator:
+        """Return the RTT estimator for a port (keyed by its base URL)."""
+        if (estimator := self._rtt_estimators.get(base_url)) is None:
+            estimator = RttEstimator(self._min_timeout, self._max_timeout)
+            self._rtt_estimators[base_url] = estimator
+        return estimator
+
+    def _write_timeout_for(self, base_url: str) -> float:
+        """Return the timeout for a POST; writes do not feed or back off the GET estimate."""
+        return max(self._write_timeout, self._rtt_estimator(base_url).timeout)
+
+    @property
+    def host(self) -> str:
+        """Return the device host."""
+        return self._host
+
+    @property
+    def request_stats(self) -> dict[str, int]:
+        """Return cumulative request counters (requests, timeouts, connection_errors, retries, hedges, oversized_responses)."""
+        return dict(self._stats)
+
+    @property
+    def request_timeouts(self) -> dict[str, float]:
+        """Return the current adaptive timeout for each port that has been used."""
+        return {base_url: estimator.timeout for base_url, estimator in self._rtt_estimators.items()}
+
+    async def _get_idempotent(self, endpoint: str, fetch: Callable[[float], Awaitable[Any]], base_url: str = None) -> Any:
+        """Run an idempotent GET with jittered exponential backoff inside an overall deadline.
+
+        The first attempt uses the port's adaptive timeout, doubling on every retry.
+        Only timeouts and dropped connections are retried; a refused or unreachable
+        port, HTTP and auth errors are final.
+        """
+        loop = asyncio.get_running_loop()
+        attempt_timeout = self._rtt_estimator(base_url or self._base_url).timeout
+        deadline = loop.time() + max(self._retry_deadline, attempt_timeout)
+        attempt = 0
+        while True:
+            remaining = deadline - loop.time()
+            try:
+                return await self._hedged(endpoint, fetch, min(attempt_timeout, remaining))
+            except (AkuBoxApiTimeoutError, AkuBoxApiDisconnectedError) as err:
+                attempt += 1
+                # Full jitter keeps a fleet of boxes from retrying in lockstep
+                backoff = random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** attempt))
+                if loop.time() + backoff >= deadline:
+                    raise
+                self._stats["retries"] += 1
+                _LOGGER.debug(
+                    "Attempt %s for %s on %s failed (%s), retrying in %.2fs",
+                    attempt, endpoint, self._host, err, backoff
+                )
+                await asyncio.sleep(backoff)
+                attempt_timeout *= 2
+
+    async def _hedged(self, endpoint: str, fetch: Callable[[float], Awaitable[Any]], timeout: float) -> Any:
+        """Run one attempt, racing a second request if the first exceeds the observed p95."""
+        samples = self._latencies.setdefault(endpoint, deque(maxlen=LATENCY_WINDOW))
+        hedge_delay = self._hedge_delay(samples)
+        if hedge_delay is None or hedge_delay >= timeout:
+            return await self._timed(samples, fetch, timeout)
+
+        tasks = [asyncio.ensure_future(self._timed(samples, fetch, timeout))]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+            if not done:
+                _LOGGER.debug("Hedging %s on %s after %.3fs", endpoint, self._host, hedge_delay)
+                self._stats["hedges"] += 1
+                tasks.append(asyncio.ensure_future(self._timed(samples, fetch, timeout - hedge_delay)))
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+            # Every request failed, surface the primary's error
+            raise tasks[0].exception()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _hedge_delay(self, samples: deque[float]) -> float | None:
+        """Return the observed p95 latency, or None when hedging is off or there is too little data."""
+        if not self._hedge_requests or len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(samples)
+        return ordered[math.ceil(HEDGE_LATENCY_PERCENTILE * len(ordered)) - 1]
+
+    @staticmethod
+    async def _timed(samples: deque[float], fetch: Callable[[float], Awaitable[Any]], timeout: float) -> Any:
+        """Await a single request and record its latency on success."""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        result = await fetch(timeout)
+        samples.append(loop.time() - start)
+        return result
+
+    @staticmethod
+    def _truncate(text: str) -> str:
+        """Shorten a body for logging."""
+        if len(text) <= LOG_BODY_MAX:
+            return text
+        return f"{text[:LOG_BODY_MAX]}... ({len(text)} chars)"
+
+    def _reject_oversized(self, response: aiohttp.ClientResponse, url: str, max_size: int) -> NoReturn:
+        self._stats["oversized_responses"] += 1
+        # Closing drops the connection instead of draining the rest of the body
+        response.close()
+        _LOGGER.debug("Response from %s exceeds %s bytes, discarded", url, max_size)
+        raise AkuBoxApiError(f"Response from {url} exceeds {max_size} bytes")
+
+    async def _read_body(self, response: aiohttp.ClientResponse, url: str, max_size: int) -> bytes:
+        """Stream the body into a buffer of at most max_size bytes."""
+        if response.content_length is not None and response.content_length > max_size:
+            self._reject_oversized(response, url, max_size)
+        body = bytearray()
+        async for chunk in response.content.iter_chunked(min(READ_CHUNK_SIZE, max_size + 1)):
+            body += chunk
+            if len(body) > max_size:
+                self._reject_oversized(response, url, max_size)
+        return bytes(body)
+
+    def _client_error(self, err: aiohttp.ClientError, url: str) -> AkuBoxApiConnectionError:
+        """Map an aiohttp error; only a dropped connection is worth retrying."""
+        self._stats["connection_errors"] += 1
+        if isinstance(err, aiohttp.ServerDisconnectedError):
+            return AkuBoxApiDisconnectedError(f"Connection to {url} closed by the device: {err}")
+        if isinstance(err, aiohttp.ClientConnectorError) and isinstance(err.os_error, ConnectionRefusedError):
+            return AkuBoxApiConnectionRefusedError(f"Connection to {url} refused: {err}")
+        return AkuBoxApiConnectionError(f"Error connecting to {url}: {err}")
+
+    async def _read_text(self, response: aiohttp.ClientResponse, url: str, max_size: int) -> str:
+        body = await self._read_body(response, url, max_size)
+        return body.decode(response.charset or "utf-8", errors="replace")
+
+    async def _read_error_preview(self, response: aiohttp.ClientResponse) -> str:
+        """Read just enough of an error body to log it."""
+        preview = (await response.content.read(LOG_BODY_MAX + 1)).decode(response.charset or "utf-8", errors="replace")
+        return preview if len(preview) <= LOG_BODY_MAX else f"{preview[:LOG_BODY_MAX]}..."
+
+    async def _request_json(self, method: str, endpoint: str, data: dict = None, base_url: str = None, timeout: float = None) -> dict:
+        """Make an API request expecting JSON response and potentially sending JSON data."""
+        url_to_use = base_url or self._base_url
+        url = f"{url_to_use}{endpoint}"
+        estimator = self._rtt_estimator(url_to_use)
+        loop = asyncio.get_running_loop()
+        _LOGGER.debug("Requesting JSON %s %s (data: %s)", method, url, data)
+        if method not in ("GET", "POST"):
+            raise AkuBoxApiError(f"Unsupported HTTP method for JSON request: {method}")
+        is_write = method == "POST"
+        kwargs = {"json": data if data is not None else {}} if is_write else {}
+        if timeout is None:
+            timeout = self._write_timeout_for(url_to_use) if is_write else estimator.timeout
+        self._stats["requests"] += 1
+        try:
+            async with asyncio.timeout(timeout):
+                start = loop.time()
+                async with self._get_session().request(method, url, **kwargs) as response:
+                    if not is_write:
+                        estimator.add_sample(loop.time() - start)
+
+                    if response.status == 200:
+                        text = await self._read_text(response, url, RESPONSE_MAX_SIZES.get(endpoint, RESPONSE_MAX_SIZE))
+                        try:
+                            json_data = json.loads(text)
+                        except ValueError:
+                            _LOGGER.error("Invalid JSON response from %s: %s", url, self._truncate(text))
+                            raise AkuBoxApiError(f"Invalid JSON response from {url}")
+                        _LOGGER.debug("Response from %s: %s", url, json_data)
+                        return json_data
+                    elif response.status == 401 or response.status == 403:
+                        _LOGGER.error("Authentication error for %s: %s", url, response.status)
+                        raise AkuBoxApiAuthError(f"Authentication error at {url}")
+                    else:
+                        _LOGGER.error(
+                            "API JSON request to %s failed with status %s: %s",
+                            url,
+                            response.status,
+                            await self._read_error_preview(response),
+                        )
+                        raise (AkuBoxApiNotFoundError if response.status == 404 else AkuBoxApiError)(
+                            f"API JSON request to {url} failed with status {response.status}"
+                        )
+        except asyncio.TimeoutError:
+            self._stats["timeouts"] += 1
+            if not is_write:
+                estimator.backoff()
+            _LOGGER.debug("Timeout during JSON request to %s", url)
+            raise AkuBoxApiTimeoutError(f"Timeout connecting to {url}")
+        except aiohttp.ClientError as err:
+            _LOGGER.debug("Client error during JSON request to %s: %s", url, err)
+            raise self._client_error(err, url)
+
+    async def _post_plain_text(self, endpoint: str, text_payload: str, base_url: str = None) -> dict:
+        """Make a POST API request sending plain text data."""
+        url_to_use = base_url or self._base_url
+        url = f"{url_to_use}{endpoint}"
+        _LOGGER.debug("Requesting POST plain text %s (payload: %s)", url, text_payload)
+        self._stats["requests"] += 1
+        headers = {'Content-Type': 'text/plain; charset=utf-8'}
+        try:
+            async with asyncio.timeout(self._write_timeout_for(url_to_use)):
+                async with self._get_session().post(url, data=text_payload.encode('utf-8'), headers=headers) as response:
+                    if response.status in (200, 204):
+                        response_text_content = await self._read_text(
+                            response, url, RESPONSE_MAX_SIZES.get(endpoint, RESPONSE_MAX_SIZE)
+                        )
+                        _LOGGER.debug("Plain text POST to %s successful with status %s. Response text: %s", url, response.status, response_text_content)
+                        return {"status": "success", "status_code": response.status, "response_text": response_text_content}
+                    elif response.status == 401 or response.status == 403:
+                        _LOGGER.error("Authentication error for plain text POST %s: %s", url, response.status)
+                        raise AkuBoxApiAuthError(f"Authentication error at {url}")
+                    else:
+                        _LOGGER.error(
+                            "API plain text POST to %s failed with status %s: %s",
+                            url,
+                            response.status,
+                            await self._read_error_preview(response),
+                        )
+                        raise (AkuBoxApiNotFoundError if response.status == 404 else AkuBoxApiError)(
+                            f"API plain text POST to {url} failed with status {response.status}"
+                        )
+        except asyncio.TimeoutError:
+            self._stats["timeouts"] += 1
+            _LOGGER.debug("Timeout during plain text POST to %s", url)
+            raise AkuBoxApiTimeoutError(f"Timeout connecting to {url}")
+        except aiohttp.ClientError as err:
+            _LOGGER.debug("Client error during plain text POST to %s: %s", url, err)
+            raise self._client_error(err, url)
+
+    async def _get_plain_text(self, endpoint: str, base_url: str = None, timeout: float = None) -> str:
+        """Make a GET API request expecting plain text response."""
+        url_to_use = base_url or self._base_url
+        url = f"{url_to_use}{endpoint}"
+        estimator = self._rtt_estimator(url_to_use)
+        loop = asyncio.get_running_loop()
+        _LOGGER.debug("Requesting GET plain text %s", url)
+        self._stats["requests"] += 1
+        try:
+            async with asyncio.timeout(timeout or estimator.timeout):
+                start = loop.time()
+                async with self._get_session().get(url) as response:
+                    estimator.add_sample(loop.time() - start)
+
+                    if response.status == 200:
+                        # State endpoints answer "on"/"off", a few bytes are enough
+                        response_text = await self._read_text(
+                            response, url, RESPONSE_MAX_SIZES.get(endpoint, RESPONSE_MAX_SIZE)
+                        )
+                        _LOGGER.debug("Plain text GET from %s successful. Response: %s", url, response_text)
+                        return response_text.strip().lower()
+                    elif response.status == 401 or response.status == 403:
+                        _LOGGER.error("Authentication error for plain text GET %s: %s", url, response.status)
+                        raise AkuBoxApiAuthError(f"Authentication error at {url}")
+                    else:
+                        _LOGGER.error(
+                            "API plain text GET from %s failed with status %s: %s",
+                            url,
+                            response.status,
+                            await self._read_error_preview(response),
+                        )
+                        raise (AkuBoxApiNotFoundError if response.status == 404 else AkuBoxApiError)(
+                            f"API plain text GET from {url} failed with status {response.status}"
+                        )
+        except asyncio.TimeoutError:
+            self._stats["timeouts"] += 1
+            estimator.backoff()
+            _LOGGER.debug("Timeout during plain text GET to %s", url)
+            raise AkuBoxApiTimeoutError(f"Timeout connecting to {url}")
+        except aiohttp.ClientError as err:
+            _LOGGER.debug("Client error during plain text GET to %s: %s", url, err)
+            raise self._client_error(err, url)
+
+
+    async def get_system_info(self) -> dict:
+        """Get system information."""
+        return await self._get_idempotent(
+            API_SYSTEM_INFO, lambda timeout: self._request_json("GET", API_SYSTEM_INFO, timeout=timeout)
+        )
+
+    async def get_volume(self) -> dict:
+        """Get current volume."""
+        return await self._get_idempotent(
+            API_VOLUME_GET, lambda timeout: self._request_json("GET", API_VOLUME_GET, timeout=timeout)
+        )
+
+    async def set_volume(self, volume_level: int) -> dict:
+        """Set volume level (0-63)."""
+        if not 0 <= volume_level <= DEVICE_VOLUME_MAX:
+            raise ValueError(f"Volume level must be between 0 and {DEVICE_VOLUME_MAX}")
+        return await self._request_json("POST", API_VOLUME_SET, data={"volume": volume_level})
+
+    async def test_connection(self) -> bool:
+        """Test if the connection to the AkuBox is working."""
+        try:
+            await self.get_system_info() # Test main API port
+            # Optionally, test switch API port if a simple GET endpoint exists
+            # await self._get_plain_text(API_DLNA_STATE, base_url=self._switch_base_url)
+            return True
+        except AkuBoxApiError:
+            return False
+
+    def get_hostname_from_system_info(self, system_info: dict) -> str | None:
+        """Extract hostname from system info, returns None if not found."""
+        try:
+            return system_info.get("system", {}).get("hostname")
+        except AttributeError:
+            return None
+
+    # --- DLNA Control ---
+    async def set_dlna_state(self, state: bool) -> dict:
+        """Set DLNA state (on/off) using plain text request body."""
+        payload_str = "on" if state else "off"
+        _LOGGER.debug(f"Setting DLNA state to plain text: {payload_str}")
+        return await self._post_plain_text(API_DLNA_STATE, payload_str, base_url=self._switch_base_url)
+
+    async def get_dlna_state(self) -> bool:
+        """Get current DLNA state. Returns True if 'on', False otherwise."""
+        state_str = await self._get_idempotent(
+            API_DLNA_STATE,
+            lambda timeout: self._get_plain_text(API_DLNA_STATE, base_url=self._switch_base_url, timeout=timeout),
+            base_url=self._switch_base_url,
+        )
+        return state_str == "on"
+
+    # --- LED Logo Control ---
+    async def set_led_logo_state(self, state: bool) -> dict:
+        """Set LED Logo state (on/off) using plain text request body."""
+        payload_str = "on" if state else "off"
+        _LOGGER.debug(f"Setting LED Logo state to plain text: {payload_str}")
+        return await self._post_plain_text(API_LED_LOGO_STATE, payload_str, base_url=self._switch_base_url)
+
+    async def get_led_logo_state(self) -> bool:
+        """Get current LED Logo state. Returns True if 'on', False otherwise."""
+        state_str = await self._get_idempotent(
+            API_LED_LOGO_STATE,
+            lambda timeout: self._get_plain_text(API_LED_LOGO_STATE, base_url=self._switch_base_url, timeout=timeout),
+            base_url=self._switch_base_url,
+        )
+        return state_str == "on"
+
+    async def get_switch_states(self, switch_types: list[str]) -> dict[str, bool]:
+        """Get the state of the given switches concurrently, keyed by switch type."""
+        getters = {
+            SWITCH_DLNA: self.get_dlna_state,
+            SWITCH_LED_LOGO: self.get_led_logo_state,
+        }
+        states = await asyncio.gather(*(getters[switch_type]() for switch_type in switch_types))
+        return dict(zip(switch_types, states))
@@ -0,0 +1,17 @@
+# /config/custom_components/akubox_controller/akubox_client/const.py
+# API Endpoints
+API_SYSTEM_INFO = "/api/system/info"
+API_VOLUME_GET = "/api/volume/get"
+API_VOLUME_SET = "/api/volume/set"
+
+# 开关 API 端点 (使用不同端口)
+API_DLNA_STATE = "/dlna/state" # 用于 GET 和 POST
+API_LED_LOGO_STATE = "/device/led_logo_state" # 用于 GET 和 POST
+
+# API port for switches
+API_PORT_SWITCHES = 2268
+
+# Switch types
+SWITCH_DLNA = "dlna_state_switch"
+SWITCH_LED_LOGO = "led_logo_state_switch"
+SWITCHES = [SWITCH_DLNA, SWITCH_LED_LOGO]
@@ -0,0 +1,86 @@
+# /config/custom_components/akubox_controller/capabilities.py
+import asyncio
+import logging
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    SWITCH_DLNA,
+    SWITCH_LED_LOGO,
+    CAP_BATTERY,
+    CAP_VOLUME,
+    CAPABILITIES,
+    CAPABILITIES_STORAGE_KEY,
+    CAPABILITIES_STORAGE_VERSION,
+)
+from .api import AkuBoxApiClient, AkuBoxApiError, AkuBoxApiConnectionRefusedError, AkuBoxApiNotFoundError
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _capability_store(hass: HomeAssistant, entry_id: str) -> Store:
+    return Store(hass, CAPABILITIES_STORAGE_VERSION, f"{CAPABILITIES_STORAGE_KEY}.{entry_id}")
+
+
+async def _async_probe(client: AkuBoxApiClient, system_info: dict[str, Any]) -> tuple[dict[str, bool], bool]:
+    """Probe which features the device has.
+
+    Returns the capabilities and whether every answer was conclusive. Only a refused
+    port or a 404 means a feature is missing. Any other error (timeout, 5xx while
+    booting, dropped connection, invalid body) counts as supported but makes the
+    result inconclusive, so it is not cached.
+    """
+    battery = system_info.get("battery") or {}
+    capabilities = {CAP_BATTERY: any(value is not None for value in battery.values())}
+    conclusive = True
+
+    getters = {
+        CAP_VOLUME: client.get_volume,
+        SWITCH_DLNA: client.get_dlna_state,
+        SWITCH_LED_LOGO: client.get_led_logo_state,
+    }
+    results = await asyncio.gather(*(getter() for getter in getters.values()), return_exceptions=True)
+    for capability, result in zip(getters, results):
+        if isinstance(result, (AkuBoxApiConnectionRefusedError, AkuBoxApiNotFoundError)):
+            # Port 80 just answered, so a refused port or a missing endpoint means the feature is missing
+            _LOGGER.debug("Probe of %s on %s failed, not supported: %s", capability, client.host, result)
+            capabilities[capability] = False
+        elif isinstance(result, AkuBoxApiError):
+            _LOGGER.debug("Probe of %s on %s was inconclusive, assuming it is supported: %s", capability, client.host, result)
+            capabilities[capability] = True
+            conclusive = False
+        elif isinstance(result, BaseException):
+            raise result
+        elif capability == CAP_VOLUME:
+            capabilities[capability] = isinstance(result, dict) and result.get("volume") is not None
+        else:
+            capabilities[capability] = True
+    return capabilities, conclusive
+
+
+async def async_get_capabilities(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    client: AkuBoxApiClient,
+    system_info: dict[str, Any],
+) -> dict[str, bool]:
+    """Return the device's capabilities, probing only when the firmware changed since the last probe."""
+    go_version = (system_info.get("system") or {}).get("go_version")
+    store = _capability_store(hass, entry.entry_id)
+    cached = await store.async_load()
+    if cached and cached.get("go_version") == go_version and set(CAPABILITIES) <= set(cached["capabilities"]):
+        return cached["capabilities"]
+
+    capabilities, conclusive = await _async_probe(client, system_info)
+    _LOGGER.info("Probed AkuBox %s (firmware %s): %s", client.host, go_version, capabilities)
+    if conclusive:
+        await store.async_save({"go_version": go_version, "capabilities": capabilities})
+    return capabilities
+
+
+async def async_remove_capabilities(hass: HomeAssistant, entry_id: str) -> None:
+    """Delete the cached capabilities of a removed entry."""
+    await _capability_store(hass, entry_id).async_remove()
@@ -1,11 +1,16 @@
 # /config/custom_components/akubox_controller/config_flow.py
+import asyncio
 import voluptuous as vol
 import logging
+import yaml
 from typing import Any
 
 from homeassistant import config_entries
 from homeassistant.core import callback
+from homeassistant.data_entry_flow import FlowResultType
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.translation import async_get_translations
+from homeassistant.helpers.selector import TextSelector, TextSelectorConfig
 from homeassistant.const import CONF_HOST
 
 from .const import (
@@ -13,8 +18,21 @@ from .const import (
     DEFAULT_NAME,
     UPDATE_INTERVAL_SYSTEM,
     UPDATE_INTERVAL_VOLUME,
+    UPDATE_INTERVAL_SWITCH,
+    CONF_SCAN_INTERVAL_SYSTEM,
+    CONF_SCAN_INTERVAL_VOLUME,
+    CONF_SCAN_INTERVAL_SWITCH,
+    CONF_STALE_GRACE,
+    DEFAULT_STALE_GRACE,
+    CONF_GAUGE_CHANGE_EVENTS,
+    DEFAULT_GAUGE_CHANGE_EVENTS,
+    CONF_GOROUTINE_CHANGE_THRESHOLD,
+    DEFAULT_GOROUTINE_CHANGE_THRESHOLD,
     CONF_CUSTOM_NAME,      # 新增
     GENERIC_HOSTNAMES,     # 新增
+    CONF_HOSTS,
+    BULK_VALIDATE_WORKERS,
+    BULK_VALIDATE_TIMEOUT,
 )
 from .api import AkuBoxApiClient, AkuBoxApiConnectionError, AkuBoxApiAuthError
 
@@ -25,14 +43,77 @@ DATA_SCHEMA = vol.Schema({
     vol.Optional(CONF_CUSTOM_NAME, default=""): str, # 新增自定义名称字段
 })
 
+BULK_SCHEMA = vol.Schema({
+    vol.Required(CONF_HOSTS): TextSelector(TextSelectorConfig(multiline=True)),
+})
+
+
+def _resolve_title(host: str, custom_name: str, api_hostname: str | None) -> str:
+    """Return the entry title: custom name, then a non-generic hostname, then the host."""
+    if custom_name:
+        return custom_name
+    if api_hostname and api_hostname.lower() not in GENERIC_HOSTNAMES:
+        return f"{DEFAULT_NAME} ({api_hostname})"
+    return f"{DEFAULT_NAME} ({host})"
+
+
+def _parse_bulk_hosts(text: str) -> list[tuple[str, str]]:
+    """Parse a pasted host list into (host, custom_name) pairs.
+
+    Accepts a YAML list of hosts or of {host, custom_name|name} mappings, a YAML
+    mapping of host to name, or plain lines of "host" / "host, name".
+    """
+    try:
+        parsed = yaml.safe_load(text)
+    except yaml.YAMLError:
+        parsed = None
+
+    pairs: list[tuple[str, str]] = []
+    if isinstance(parsed, dict):
+        pairs = [(str(host), str(name or "")) for host, name in parsed.items()]
+    elif isinstance(parsed, list):
+        for item in parsed:
+            if isinstance(item, dict):
+                host = item.get(CONF_HOST)
+                name = item.get(CONF_CUSTOM_NAME) or item.get("name") or ""
+                if host:
+                    pairs.append((str(host), str(name)))
+            elif item is not None:
+                pairs.append((str(item), ""))
+    else: # Plain lines, YAML folds these into a single string
+        for line in text.splitlines():
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            host, _, name = line.replace(",", " ", 1).partition(" ")
+            pairs.append((host, name))
+
+    seen: set[str] = set()
+    result: list[tuple[str, str]] = []
+    for host, name in pairs:
+        host = host.strip()
+        if host and host not in seen:
+            seen.add(host)
+            result.append((host, name.strip()))
+    return result
+
+
 class AkuBoxConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for AkuBox Controller."""
 
     VERSION = 1
     CONNECTION_CLASS = config_entries.CONN_CLASS_LOCAL_POLL
 
+    def __init__(self) -> None:
+        """Initialize the config flow."""
+        self._bulk_results: list[dict[str, Any]] = []
+
     async def async_step_user(self, user_input: dict[str, Any] | None = None):
-        """Handle the initial step."""
+        """Let the user add a single device or a list of devices."""
+        return self.async_show_menu(step_id="user", menu_options=["manual", "bulk"])
+
+    async def async_step_manual(self, user_input: dict[str, Any] | None = None):
+        """Handle adding a single device."""
         errors = {}
         if user_input is not None:
             host = user_input[CONF_HOST]
@@ -48,13 +129,7 @@ class AkuBoxConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             try:
                 system_info = await client.get_system_info()
                 api_hostname = client.get_hostname_from_system_info(system_info)
-
-                if custom_name:
-                    entry_title = custom_name
-                elif api_hostname and api_hostname.lower() not in GENERIC_HOSTNAMES:
-                    entry_title = f"{DEFAULT_NAME} ({api_hostname})"
-                else:
-                    entry_title = f"{DEFAULT_NAME} ({host})"
+                entry_title = _resolve_title(host, custom_name, api_hostname)
 
                 # Store the host and potentially the custom_name if needed elsewhere from entry.data
                 # For this purpose, only host is strictly needed in data for client re-creation.
@@ -94,7 +169,162 @@ class AkuBoxConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         })
 
         return self.async_show_form(
-            step_id="user", data_schema=form_schema, errors=errors
+            step_id="manual", data_schema=form_schema, errors=errors
+        )
+
+    async def async_step_bulk(self, user_input: dict[str, Any] | None = None):
+        """Validate a pasted list of devices concurrently."""
+        errors = {}
+        if user_input is not None:
+            hosts = _parse_bulk_hosts(user_input[CONF_HOSTS])
+            if not hosts:
+                errors["base"] = "no_hosts"
+            else:
+                configured = self._async_current_ids()
+                session = async_get_clientsession(self.hass)
+                semaphore = asyncio.Semaphore(BULK_VALIDATE_WORKERS)
+                self._bulk_results = await asyncio.gather(*(
+                    self._async_validate_host(session, semaphore, host, custom_name, configured)
+                    for host, custom_name in hosts
+                ))
+                if any(result["ok"] for result in self._bulk_results):
+                    return await self.async_step_bulk_confirm()
+                errors["base"] = "no_valid_hosts"
+
+        return self.async_show_form(
+            step_id="bulk",
+            data_schema=self.add_suggested_values_to_schema(BULK_SCHEMA, user_input),
+            errors=errors,
+        )
+
+    async def async_step_bulk_confirm(self, user_input: dict[str, Any] | None = None):
+        """Show per-host validation results, then create all valid entries."""
+        valid = [result for result in self._bulk_results if result["ok"]]
+        if user_input is not None:
+            # Awaited so imports that abort (already configured meanwhile) are not counted
+            flow_results = await asyncio.gather(*(
+                self.hass.config_entries.flow.async_init(
+                    DOMAIN,
+                    context={"source": config_entries.SOURCE_IMPORT},
+                    data={
+                        CONF_HOST: result["host"],
+                        CONF_CUSTOM_NAME: result["custom_name"],
+                        "title": result["title"],
+                    },
+                )
+                for result in valid
+            ), return_exceptions=True)
+            created = 0
+            for result, flow_result in zip(valid, flow_results):
+                if isinstance(flow_result, BaseException):
+                    _LOGGER.warning("Could not add %s: %s", result["host"], flow_result)
+                elif flow_result["type"] == FlowResultType.CREATE_ENTRY:
+                    created += 1
+                else:
+                    _LOGGER.warning("Did not add %s: %s", result["host"], flow_result.get("reason"))
+            return self.async_abort(
+                reason="bulk_created",
+                description_placeholders={"created": str(created), "count": str(len(valid))},
+            )
+
+        error_texts = await async_get_translations(
+            self.hass, self.hass.config.language, "config", {DOMAIN}
+        )
+        lines = []
+        for result in self._bulk_results:
+            if result["ok"]:
+                switch_port = "✅" if result["switch_port_ok"] else "❌"
+                lines.append(
+                    f"- ✅ `{result['host']}` → {result['title']} "
+                    f"({result['latency_ms']} ms, :2268 {switch_port})"
+                )
+            else:
+                error = error_texts.get(
+                    f"component.{DOMAIN}.config.error.{result['error']}", result["error"]
+                )
+                lines.append(f"- ❌ `{result['host']}` → {error}")
+
+        return self.async_show_form(
+            step_id="bulk_confirm",
+            data_schema=vol.Schema({}),
+            description_placeholders={
+                "results": "\n".join(lines),
+                "count": str(len(valid)),
+            },
+        )
+
+    async def _async_validate_host(
+        self,
+        session,
+        semaphore: asyncio.Semaphore,
+        host: str,
+        custom_name: str,
+        configured: set[str | None],
+    ) -> dict[str, Any]:
+        """Check port 80 and port 2268 of one host with short timeouts."""
+        result: dict[str, Any] = {
+            "host": host,
+            "custom_name": custom_name,
+            "ok": False,
+            "title": None,
+            "latency_ms": None,
+            "switch_port_ok": False,
+            "error": None,
+        }
+        if host in configured:
+            result["error"] = "already_configured"
+            return result
+
+        client = AkuBoxApiClient(
+            host,
+            session,
+            retry_deadline=BULK_VALIDATE_TIMEOUT,
+            max_timeout=BULK_VALIDATE_TIMEOUT,
+        )
+        loop = asyncio.get_running_loop()
+        latency: float | None = None
+
+        async def _get_system_info() -> dict:
+            nonlocal latency
+            start = loop.time()
+            system_info = await client.get_system_info()
+            latency = loop.time() - start
+            return system_info
+
+        async with semaphore:
+            system_info, switch_state = await asyncio.gather(
+                _get_system_info(),
+                client.get_dlna_state(),
+                return_exceptions=True,
+            )
+
+        if isinstance(system_info, AkuBoxApiConnectionError):
+            result["error"] = "cannot_connect"
+        elif isinstance(system_info, AkuBoxApiAuthError):
+            result["error"] = "invalid_auth"
+        elif isinstance(system_info, BaseException):
+            _LOGGER.debug("Bulk validation of %s failed: %s", host, system_info)
+            result["error"] = "unknown"
+        else:
+            api_hostname = client.get_hostname_from_system_info(system_info)
+            result["ok"] = True
+            result["title"] = _resolve_title(host, custom_name, api_hostname)
+            result["latency_ms"] = round(latency * 1000)
+            result["switch_port_ok"] = not isinstance(switch_state, BaseException)
+        return result
+
+    async def async_step_import(self, import_data: dict[str, Any]):
+        """Create an entry for a device already validated by the bulk step."""
+        host = import_data[CONF_HOST]
+        await self.async_set_unique_id(host)
+        self._abort_if_unique_id_configured()
+
+        config_data_to_store = {CONF_HOST: host}
+        if custom_name := import_data.get(CONF_CUSTOM_NAME):
+            config_data_to_store[CONF_CUSTOM_NAME] = custom_name
+        return self.async_create_entry(
+            title=import_data.get("title") or _resolve_title(host, custom_name or "", None),
+            data=config_data_to_store,
         )
 
     @staticmethod
@@ -118,21 +348,49 @@ class AkuBoxOptionsFlowHandler(config_entries.OptionsFlow):
             return self.async_create_entry(title="", data=user_input)
 
         scan_interval_system = self.config_entry.options.get(
-            "scan_interval_system", UPDATE_INTERVAL_SYSTEM
+            CONF_SCAN_INTERVAL_SYSTEM, UPDATE_INTERVAL_SYSTEM
         )
         scan_interval_volume = self.config_entry.options.get(
-            "scan_interval_volume", UPDATE_INTERVAL_VOLUME
+            CONF_SCAN_INTERVAL_VOLUME, UPDATE_INTERVAL_VOLUME
+        )
+        scan_interval_switch = self.config_entry.options.get(
+            CONF_SCAN_INTERVAL_SWITCH, UPDATE_INTERVAL_SWITCH
+        )
+        stale_grace = self.config_entry.options.get(
+            CONF_STALE_GRACE, DEFAULT_STALE_GRACE
+        )
+        gauge_change_events = self.config_entry.options.get(
+            CONF_GAUGE_CHANGE_EVENTS, DEFAULT_GAUGE_CHANGE_EVENTS
+        )
+        goroutine_change_threshold = self.config_entry.options.get(
+            CONF_GOROUTINE_CHANGE_THRESHOLD, DEFAULT_GOROUTINE_CHANGE_THRESHOLD
         )
 
         options_schema = vol.Schema({
             vol.Optional(
-                "scan_interval_system",
+                CONF_SCAN_INTERVAL_SYSTEM,
                 default=scan_interval_system,
             ): vol.All(vol.Coerce(int), vol.Range(min=5)),
             vol.Optional(
-                "scan_interval_volume",
+                CONF_SCAN_INTERVAL_VOLUME,
                 default=scan_interval_volume,
             ): vol.All(vol.Coerce(int), vol.Range(min=5)),
+            vol.Optional(
+                CONF_SCAN_INTERVAL_SWITCH,
+                default=scan_interval_switch,
+            ): vol.All(vol.Coerce(int), vol.Range(min=5)),
+            vol.Optional(
+                CONF_STALE_GRACE,
+                default=stale_grace,
+            ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+            vol.Optional(
+                CONF_GAUGE_CHANGE_EVENTS,
+                default=gauge_change_events,
+            ): bool,
+            vol.Optional(
+                CONF_GOROUTINE_CHANGE_THRESHOLD,
+                default=goroutine_change_threshold,
+            ): vol.All(vol.Coerce(int), vol.Range(min=0)),
         })
 
         return self.async_show_form(
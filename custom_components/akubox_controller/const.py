@@ -1,4 +1,17 @@
 # /config/custom_components/akubox_controller/const.py
+# Device API constants live in the standalone client package
+from .akubox_client.const import (  # noqa: F401
+    API_SYSTEM_INFO,
+    API_VOLUME_GET,
+    API_VOLUME_SET,
+    API_DLNA_STATE,
+    API_LED_LOGO_STATE,
+    API_PORT_SWITCHES,
+    SWITCH_DLNA,
+    SWITCH_LED_LOGO,
+    SWITCHES,
+)
+
 DOMAIN = "akubox_controller"
 PLATFORMS = ["sensor", "media_player", "switch"]
 
@@ -7,19 +20,26 @@ CONF_CUSTOM_NAME = "custom_name" # 新增：用于自定义名称的常量
 DEFAULT_NAME = "AkuBox"
 GENERIC_HOSTNAMES = ["akubox", "localhost", "unknown", "default", "system"] # 可根据需要添加更多通用主机名
 
+# 批量添加设备
+CONF_HOSTS = "hosts"
+BULK_VALIDATE_WORKERS = 8 # 同时验证的设备数量上限
+BULK_VALIDATE_TIMEOUT = 3 # 每台设备的验证超时 (秒)
+
 # 更新间隔 (秒)
 UPDATE_INTERVAL_SYSTEM = 60
 UPDATE_INTERVAL_VOLUME = 10
-UPDATE_INTERVAL_SWITCH = 300 # 开关状态默认轮询间隔 (如果使用协调器或单独轮询)
+UPDATE_INTERVAL_SWITCH = 300 # 开关状态默认轮询间隔 (由开关协调器使用)
 
-# API Endpoints
-API_SYSTEM_INFO = "/api/system/info"
-API_VOLUME_GET = "/api/volume/get"
-API_VOLUME_SET = "/api/volume/set"
+# DLNA (UPnP GENA) 事件订阅
+DLNA_SEARCH_TIMEOUT = 4 # 单播 M-SEARCH 等待响应的时间 (秒)
+DLNA_RETRY_INTERVAL = 300 # 未订阅时重试发现/订阅的间隔 (秒)，期间回退为轮询
 
-# 开关 API 端点 (使用不同端口)
-API_DLNA_STATE = "/dlna/state" # 用于 GET 和 POST
-API_LED_LOGO_STATE = "/device/led_logo_state" # 用于 GET 和 POST
+# 选项
+CONF_SCAN_INTERVAL_SYSTEM = "scan_interval_system"
+CONF_SCAN_INTERVAL_VOLUME = "scan_interval_volume"
+CONF_SCAN_INTERVAL_SWITCH = "scan_interval_switch"
+CONF_STALE_GRACE = "stale_grace_period"
+DEFAULT_STALE_GRACE = 300 # 轮询失败后继续提供上次数据的时间 (秒)，0 表示立即不可用
 
 # Sensor types
 SENSOR_CPU_USAGE = "cpu_usage"
@@ -34,15 +54,58 @@ SENSOR_GO_VERSION = "go_version"
 SENSOR_NUM_GOROUTINE = "num_goroutine"
 SENSOR_WORK_DIR = "work_dir"
 
-# Switch types
-SWITCH_DLNA = "dlna_state_switch"
-SWITCH_LED_LOGO = "led_logo_state_switch"
+# Media player types
+MEDIA_PLAYER_VOLUME = "mediaplayer_volume"
+
+# 设备能力 (按固件 go_version 缓存探测结果，固件变化时重新探测)
+CAP_BATTERY = "battery"
+CAP_VOLUME = "volume"
+CAPABILITIES = [CAP_BATTERY, CAP_VOLUME, *SWITCHES]
+BATTERY_SENSORS = [SENSOR_BATTERY_LEVEL, SENSOR_BATTERY_STATUS]
+CAPABILITIES_STORAGE_KEY = f"{DOMAIN}.capabilities" # 每个条目一个文件: <key>.<entry_id>
+CAPABILITIES_STORAGE_VERSION = 1
 
 # Attributes for system info
 ATTR_CPU_NUM = "num_cpu"
 ATTR_GO_MAX_PROC = "go_max_proc"
 ATTR_MEMORY_TOTAL_MB = "memory_total_mb"
 ATTR_MEMORY_USED_MB = "memory_used_mb"
+ATTR_STALE = "stale" # 轮询失败但仍在宽限期内，显示的是上次成功获取的数据
+ATTR_LAST_SUCCESSFUL_UPDATE = "last_successful_update"
+
+# 服务
+SERVICE_SNAPSHOT = "snapshot"
+SERVICE_RESTORE = "restore"
+ATTR_SNAPSHOT_ID = "snapshot_id"
+ATTR_MAX_AGE = "max_age"
+ATTR_PERSIST = "persist"
+DEFAULT_SNAPSHOT_ID = "default"
+DEFAULT_SNAPSHOT_MAX_AGE = 60 # 协调器缓存数据在此时间 (秒) 内视为有效
+DEFAULT_RESTORE_MAX_AGE = 0 # 恢复时默认实时读取设备，避免因过时缓存跳过写入
+SNAPSHOT_STORAGE_KEY = f"{DOMAIN}.snapshots"
+SNAPSHOT_STORAGE_VERSION = 1
+
+# Prometheus 指标端点 (需要 HA 身份验证)
+METRICS_URL = "/api/akubox_controller/metrics"
+
+# 事件: 相邻两次数据之间变化的字段，以及由此推导出的重启/固件变化
+EVENT_CHANGED = f"{DOMAIN}_changed"
+EVENT_REBOOTED = f"{DOMAIN}_rebooted"
+EVENT_FIRMWARE_CHANGED = f"{DOMAIN}_firmware_changed"
+CHANGE_START_TIME = "system.start_time"
+CHANGE_GO_VERSION = "system.go_version"
+# 几乎每次轮询都会变化的指标，默认不计入 changed 事件 (可在选项中开启)
+GAUGE_CHANGE_PATHS = ["cpu.usage", "memory.used"]
+CONF_GAUGE_CHANGE_EVENTS = "gauge_change_events"
+DEFAULT_GAUGE_CHANGE_EVENTS = False
+# 协程数只在与上次报告的值相差达到阈值时计入 changed 事件，用于发现协程数激增 (0 表示每次变化都报告)
+CHANGE_NUM_GOROUTINE = "system.num_goroutine"
+CONF_GOROUTINE_CHANGE_THRESHOLD = "goroutine_change_threshold"
+DEFAULT_GOROUTINE_CHANGE_THRESHOLD = 50
 
-# API port for switches
-API_PORT_SWITCHES = 2268
\ No newline at end of file
+# 实时指标 WebSocket 订阅
+WS_TYPE_SUBSCRIBE_METRICS = f"{DOMAIN}/subscribe_metrics"
+WS_METRICS_UPDATE_INTERVAL = 2 # 有订阅者时系统信息和音量的轮询间隔 (秒)，实体状态仍按配置的间隔写入
+WS_DEFAULT_MIN_INTERVAL = 1 # 每个订阅者两次推送之间的默认最短间隔 (秒)
+WS_MIN_INTERVAL = 0.5
+SIGNAL_ENTRY_SETUP = f"{DOMAIN}_entry_setup" # 条目 (重新) 设置完成后发送，订阅据此重新连接到新的协调器
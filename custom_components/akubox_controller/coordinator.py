@@ -0,0 +1,392 @@
+# /config/custom_components/akubox_controller/coordinator.py
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.const import CONF_HOST
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    DEFAULT_STALE_GRACE,
+    WS_METRICS_UPDATE_INTERVAL,
+    EVENT_CHANGED,
+    EVENT_REBOOTED,
+    EVENT_FIRMWARE_CHANGED,
+    CHANGE_START_TIME,
+    CHANGE_GO_VERSION,
+    CHANGE_NUM_GOROUTINE,
+    GAUGE_CHANGE_PATHS,
+    DEFAULT_GAUGE_CHANGE_EVENTS,
+    DEFAULT_GOROUTINE_CHANGE_THRESHOLD,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_entity_enabled(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    platform: str,
+    key: str,
+    enabled_default: bool = True,
+) -> bool:
+    """Return whether the entity for key is enabled in the entity registry.
+
+    Entities that are not registered yet (first setup) fall back to their enabled default.
+    """
+    registry = er.async_get(hass)
+    entity_id = registry.async_get_entity_id(platform, DOMAIN, f"{entry.unique_id}_{key}")
+    if entity_id is None:
+        return enabled_default
+    registry_entry = registry.async_get(entity_id)
+    return registry_entry is not None and not registry_entry.disabled
+
+
+def structural_diff(old: Any, new: Any, prefix: str = "") -> dict[str, dict[str, Any]]:
+    """Return {dotted.path: {"old": ..., "new": ...}} for every leaf that differs.
+
+    Nested dicts are walked; any other value (lists included) is compared as a whole.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        changes: dict[str, dict[str, Any]] = {}
+        for key in old.keys() | new.keys():
+            changes.update(structural_diff(old.get(key), new.get(key), f"{prefix}{key}."))
+        return changes
+    if old == new:
+        return {}
+    return {prefix.rstrip("."): {"old": old, "new": new}}
+
+
+class AkuBoxDataUpdateCoordinator(DataUpdateCoordinator):
+    """Coordinator for one AkuBox endpoint that knows which entities consume it."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        name: str,
+        update_method: Callable[[], Awaitable[Any]],
+        update_interval: timedelta,
+        platform: str,
+        entity_keys: dict[str, bool],
+        stale_grace: int = DEFAULT_STALE_GRACE,
+        gauge_change_events: bool = DEFAULT_GAUGE_CHANGE_EVENTS,
+        goroutine_change_threshold: int = DEFAULT_GOROUTINE_CHANGE_THRESHOLD,
+    ) -> None:
+        """Initialize the coordinator.
+
+        entity_keys maps the unique_id suffix of every entity fed by this endpoint
+        to whether that entity is enabled by default. After a failed poll, entities
+        keep showing the last data for stale_grace seconds before going unavailable.
+        Change events leave out GAUGE_CHANGE_PATHS unless gauge_change_events is set,
+        and report the goroutine count once it moved goroutine_change_threshold away
+        from the last reported value.
+        """
+        super().__init__(
+            hass,
+            _LOGGER,
+            config_entry=entry,
+            name=name,
+            update_method=update_method,
+            update_interval=update_interval,
+        )
+        self._platform = platform
+        self._entity_keys = entity_keys
+        # Bumped on every successful fetch so consumers can cache derived output
+        self.data_version = 0
+        self._data_updated_at: float | None = None
+        self.last_data_time: datetime | None = None
+        self._stale_grace = stale_grace
+        self._cancel_grace_timer = None
+        # Start of the current run of failed polls; the grace window counts from here
+        self._failing_since: float | None = None
+        # Configured interval; the effective update_interval also depends on push and live metrics
+        self._base_update_interval = update_interval
+        self._push_active = False
+        # Live metrics subscribers are served every poll, entities at most once per configured interval
+        self._metrics_listeners: list[CALLBACK_TYPE] = []
+        self._remove_metrics_keepalive: CALLBACK_TYPE | None = None
+        self._polled = False
+        self._entities_notified_at = 0.0
+        self._entities_notified_success = True
+        # Data the last change event was computed from
+        self._event_data: Any = None
+        self._gauge_change_events = gauge_change_events
+        self._goroutine_change_threshold = goroutine_change_threshold
+        self._reported_goroutines: Any = None
+
+    async def _async_update_data(self) -> Any:
+        """Fetch data from the endpoint."""
+        data = await super()._async_update_data()
+        self._polled = True
+        self.data_version += 1
+        self._data_updated_at = time.monotonic()
+        self.last_data_time = dt_util.utcnow()
+        return data
+
+    @callback
+    def async_set_updated_data(self, data: Any) -> None:
+        """Store data confirmed outside a poll (e.g. after a write) and notify listeners."""
+        self.data_version += 1
+        self._data_updated_at = time.monotonic()
+        self.last_data_time = dt_util.utcnow()
+        super().async_set_updated_data(data)
+
+    @callback
+    def _async_fire_changes(self) -> None:
+        """Fire a compact change event, plus reboot/firmware events derived from it.
+
+        Runs at the rate entities are notified, so the faster polls for live metrics
+        add no events; the diff is against the data of the previous evaluation, so
+        changes seen only by those polls are still reported.
+        """
+        if not self.last_update_success or self.data is None or self.data is self._event_data:
+            return
+        old, self._event_data = self._event_data, self.data
+        if old is None:
+            self._reported_goroutines = self._goroutines(self.data)
+            return
+        changes = structural_diff(old, self.data)
+        if not self._gauge_change_events:
+            for path in GAUGE_CHANGE_PATHS:
+                changes.pop(path, None)
+        if (change := changes.pop(CHANGE_NUM_GOROUTINE, None)) is not None:
+            self._async_report_goroutines(changes, change["new"])
+        if not changes:
+            return
+        entry = self.config_entry
+        device = dr.async_get(self.hass).async_get_device(
+            identifiers={(DOMAIN, entry.unique_id or entry.entry_id)}
+        )
+        event_data = {
+            "entry_id": entry.entry_id,
+            "host": entry.data[CONF_HOST],
+            "device_id": device.id if device else None,
+        }
+        self.hass.bus.async_fire(EVENT_CHANGED, {**event_data, "changes": changes})
+        # A first-seen value (None before) is not a reboot or an upgrade
+        if (change := changes.get(CHANGE_START_TIME)) and change["old"] is not None:
+            self.hass.bus.async_fire(EVENT_REBOOTED, {**event_data, "start_time": change["new"]})
+        if (change := changes.get(CHANGE_GO_VERSION)) and change["old"] is not None:
+            self.hass.bus.async_fire(
+                EVENT_FIRMWARE_CHANGED,
+                {**event_data, "old_version": change["old"], "new_version": change["new"]},
+            )
+
+    @staticmethod
+    def _goroutines(data: Any) -> Any:
+        if not isinstance(data, dict):
+            return None
+        return (data.get("system") or {}).get("num_goroutine")
+
+    @callback
+    def _async_report_goroutines(self, changes: dict[str, dict[str, Any]], new: Any) -> None:
+        """Add the goroutine count to changes once it is far enough from the last reported value.
+
+        Comparing against the last reported value (not the previous poll) also catches a
+        slow climb; "old" in the event is that reported value.
+        """
+        reported = self._reported_goroutines
+        if (
+            isinstance(new, (int, float))
+            and isinstance(reported, (int, float))
+            and abs(new - reported) < self._goroutine_change_threshold
+        ):
+            return
+        changes[CHANGE_NUM_GOROUTINE] = {"old": reported, "new": new}
+        self._reported_goroutines = new
+
+    def _grace_remaining(self) -> float:
+        """Seconds the last good data may still be served since polls started failing."""
+        if self.data is None or self._failing_since is None:
+            return 0
+        return self._stale_grace - (time.monotonic() - self._failing_since)
+
+    @property
+    def is_stale(self) -> bool:
+        """Return True while the last poll failed but the last good data is still served."""
+        return not self.last_update_success and self._grace_remaining() > 0
+
+    @property
+    def data_available(self) -> bool:
+        """Return True if entities should show data: fresh, or stale within the grace window."""
+        return self.last_update_success or self._grace_remaining() > 0
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify listeners, and once more when the grace window of stale data runs out.
+
+        Repeated failed polls do not notify listeners, so expiry needs its own timer.
+        """
+        if self.last_update_success:
+            self._failing_since = None
+        elif self._failing_since is None:
+            self._failing_since = time.monotonic()
+        if self._cancel_grace_timer is not None:
+            self._cancel_grace_timer()
+            self._cancel_grace_timer = None
+        if self.is_stale:
+            self._cancel_grace_timer = async_call_later(
+                self.hass, self._grace_remaining(), self._async_grace_expired
+            )
+        for update_callback in list(self._metrics_listeners):
+            update_callback()
+        polled, self._polled = self._polled, False
+        now = time.monotonic()
+        if (
+            polled
+            and self._metrics_listeners
+            and self.last_update_success == self._entities_notified_success
+            and now - self._entities_notified_at < self._base_update_interval.total_seconds()
+        ):
+            # A faster poll for live metrics, entity state is written at the configured rate
+            return
+        self._entities_notified_at = now
+        self._entities_notified_success = self.last_update_success
+        self._async_fire_changes()
+        super().async_update_listeners()
+
+    @callback
+    def _async_grace_expired(self, _now: datetime) -> None:
+        self._cancel_grace_timer = None
+        _LOGGER.debug("Stale data of %s expired, entities become unavailable", self.name)
+        super().async_update_listeners()
+
+    @callback
+    def async_set_stale_grace(self, seconds: int) -> None:
+        """Apply a new grace window, re-evaluating entities that currently show stale data."""
+        if seconds == self._stale_grace:
+            return
+        was_serving_stale = not self.last_update_success and self.data_available
+        self._stale_grace = seconds
+        if was_serving_stale or self.is_stale:
+            self.async_update_listeners()
+
+    async def async_shutdown(self) -> None:
+        """Cancel the grace timer and drop live metrics listeners along with any scheduled poll."""
+        if self._cancel_grace_timer is not None:
+            self._cancel_grace_timer()
+            self._cancel_grace_timer = None
+        # Subscribers re-attach to the coordinator that replaces this one
+        self._metrics_listeners.clear()
+        if self._remove_metrics_keepalive is not None:
+            self._remove_metrics_keepalive()
+            self._remove_metrics_keepalive = None
+        await super().async_shutdown()
+
+    @callback
+    def async_fresh_data(self, max_age: float) -> Any | None:
+        """Return the cached data if it was confirmed within max_age seconds or is kept current by push, else None."""
+        if self.data is None or self._data_updated_at is None or not self.last_update_success:
+            return None
+        if self._push_active:
+            return self.data
+        if time.monotonic() - self._data_updated_at > max_age:
+            return None
+        return self.data
+
+    @callback
+    def async_has_enabled_entities(self) -> bool:
+        """Return True if at least one enabled entity depends on this endpoint."""
+        return any(
+            async_entity_enabled(self.hass, self.config_entry, self._platform, key, enabled_default)
+            for key, enabled_default in self._entity_keys.items()
+        )
+
+    @callback
+    def _async_apply_update_interval(self) -> None:
+        """Derive the polling interval from the configured one, push updates and live metrics."""
+        if self._push_active:
+            update_interval = None
+        elif self._metrics_listeners:
+            update_interval = min(self._base_update_interval, timedelta(seconds=WS_METRICS_UPDATE_INTERVAL))
+        else:
+            update_interval = self._base_update_interval
+        if update_interval == self.update_interval:
+            return
+        _LOGGER.debug("Update interval of %s is now %s", self.name, update_interval)
+        self.update_interval = update_interval
+        if update_interval is None:
+            self._unschedule_refresh()
+        elif self._listeners:
+            # Re-arm the poll so the new interval applies from now; suspended coordinators stay idle
+            self._schedule_refresh()
+
+    @callback
+    def async_set_gauge_change_events(self, enabled: bool) -> None:
+        """Include or leave out continuously changing gauges in change events."""
+        self._gauge_change_events = enabled
+
+    @callback
+    def async_set_goroutine_change_threshold(self, threshold: int) -> None:
+        """Set how far the goroutine count must move before a change event reports it."""
+        self._goroutine_change_threshold = threshold
+
+    @callback
+    def async_set_update_interval(self, seconds: int) -> None:
+        """Apply a new polling interval without reloading the entry."""
+        self._base_update_interval = timedelta(seconds=seconds)
+        self._async_apply_update_interval()
+
+    @callback
+    def async_set_push_active(self, active: bool) -> None:
+        """Stop polling while pushed updates arrive, and resume it when the push channel drops."""
+        if active == self._push_active:
+            return
+        self._push_active = active
+        _LOGGER.debug("Push updates %s for %s", "active" if active else "lost", self.name)
+        self._async_apply_update_interval()
+        if not active and self._listeners:
+            # Changes may have been missed since the last event
+            self.hass.async_create_task(self.async_request_refresh())
+
+    @callback
+    def async_add_metrics_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call update_callback on every update and poll faster while any such listener exists.
+
+        This also polls coordinators that are suspended because no entity is enabled.
+        """
+        self._metrics_listeners.append(update_callback)
+        if len(self._metrics_listeners) == 1:
+            # An empty regular listener keeps the poll scheduled without entities
+            self._remove_metrics_keepalive = self.async_add_listener(lambda: None)
+            self._async_apply_update_interval()
+            if self.data is None or not self.last_update_success:
+                self.hass.async_create_task(self.async_request_refresh())
+
+        @callback
+        def remove_listener() -> None:
+            if update_callback not in self._metrics_listeners:
+                return # Already dropped by async_shutdown
+            self._metrics_listeners.remove(update_callback)
+            if not self._metrics_listeners:
+                self._async_apply_update_interval()
+                self._remove_metrics_keepalive()
+                self._remove_metrics_keepalive = None
+
+        return remove_listener
+
+    async def async_setup(self, required: bool = True) -> None:
+        """Run the first refresh, unless no enabled entity needs this endpoint.
+
+        A suspended coordinator never gets a listener, so it is never scheduled.
+        Enabling an entity reloads the config entry, which re-evaluates this.
+        A failed first refresh raises ConfigEntryNotReady only if required; otherwise
+        just this endpoint's entities start unavailable and the regular polls retry.
+        """
+        if not self.async_has_enabled_entities():
+            _LOGGER.debug("No enabled entities use %s, polling suspended", self.name)
+            return
+        if required:
+            await self.async_config_entry_first_refresh()
+        else:
+            await self.async_refresh()
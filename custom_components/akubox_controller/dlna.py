@@ -0,0 +1,134 @@
+# /config/custom_components/akubox_controller/dlna.py
+import asyncio
+import logging
+from collections.abc import Callable, Sequence
+from urllib.parse import urlparse
+
+from async_upnp_client.aiohttp import AiohttpNotifyServer, AiohttpSessionRequester
+from async_upnp_client.client import UpnpService, UpnpStateVariable
+from async_upnp_client.client_factory import UpnpFactory
+from async_upnp_client.exceptions import UpnpError
+from async_upnp_client.profiles.dlna import DmrDevice
+from async_upnp_client.search import async_search
+from async_upnp_client.ssdp import SSDP_PORT
+from async_upnp_client.utils import async_get_local_ip
+
+from homeassistant.components import ssdp
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import DLNA_SEARCH_TIMEOUT
+
+_LOGGER = logging.getLogger(__name__)
+
+MEDIA_RENDERER_ST = "urn:schemas-upnp-org:device:MediaRenderer:1"
+
+
+class AkuBoxDlnaListener:
+    """Receive playback and volume changes from the box's DLNA renderer via UPnP GENA events."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        host: str,
+        on_update: Callable[[], None],
+        on_lost: Callable[[], None],
+    ) -> None:
+        """Initialize the listener.
+
+        on_update is called for every event, on_lost once a subscription could not be renewed.
+        """
+        self._hass = hass
+        self._host = host
+        self._on_update = on_update
+        self._on_lost = on_lost
+        self._notify_server: AiohttpNotifyServer | None = None
+        self.device: DmrDevice | None = None
+
+    @property
+    def subscribed(self) -> bool:
+        """Return True while GENA events are being received."""
+        return self.device is not None
+
+    async def _async_find_location(self) -> str | None:
+        """Return the renderer's description URL, from the SSDP cache or a unicast M-SEARCH."""
+        if "ssdp" in self._hass.config.components:
+            for discovery_info in await ssdp.async_get_discovery_info_by_st(self._hass, MEDIA_RENDERER_ST):
+                if urlparse(discovery_info.ssdp_location).hostname == self._host:
+                    return discovery_info.ssdp_location
+
+        locations: list[str] = []
+
+        async def _async_on_response(headers) -> None:
+            if location := headers.get("location"):
+                locations.append(location)
+
+        await async_search(
+            _async_on_response,
+            timeout=DLNA_SEARCH_TIMEOUT,
+            search_target=MEDIA_RENDERER_ST,
+            target=(self._host, SSDP_PORT),
+        )
+        return locations[0] if locations else None
+
+    async def async_start(self) -> bool:
+        """Find the renderer and subscribe to AVTransport/RenderingControl.
+
+        Returns False when the renderer is absent or refuses subscriptions; callers keep polling.
+        """
+        if self.subscribed:
+            return True
+        notify_server: AiohttpNotifyServer | None = None
+        try:
+            if (location := await self._async_find_location()) is None:
+                _LOGGER.debug("No DLNA renderer found on %s", self._host)
+                return False
+            requester = AiohttpSessionRequester(async_get_clientsession(self._hass), with_sleep=True)
+            upnp_device = await UpnpFactory(requester, non_strict=True).async_create_device(location)
+            _, local_ip = await async_get_local_ip(location)
+            notify_server = AiohttpNotifyServer(requester, source=(local_ip, 0))
+            await notify_server.async_start_server()
+            device = DmrDevice(upnp_device, notify_server.event_handler)
+            device.on_event = self._on_event
+            await device.async_subscribe_services(auto_resubscribe=True)
+        except (UpnpError, OSError, asyncio.TimeoutError) as err:
+            _LOGGER.debug("Could not subscribe to DLNA events on %s: %s", self._host, err)
+            if notify_server is not None:
+                await notify_server.async_stop_server()
+            return False
+
+        _LOGGER.debug("Subscribed to DLNA events on %s (%s)", self._host, location)
+        self.device = device
+        self._notify_server = notify_server
+        return True
+
+    async def async_stop(self) -> None:
+        """Unsubscribe and stop the callback server."""
+        device, notify_server = self.device, self._notify_server
+        self.device = None
+        self._notify_server = None
+        await self._async_release(device, notify_server)
+
+    async def _async_release(self, device: DmrDevice | None, notify_server: AiohttpNotifyServer | None) -> None:
+        if device is not None:
+            device.on_event = None
+            try:
+                await device.async_unsubscribe_services()
+            except UpnpError as err:
+                _LOGGER.debug("Error unsubscribing from DLNA events on %s: %s", self._host, err)
+        if notify_server is not None:
+            await notify_server.async_stop_server()
+
+    @callback
+    def _on_event(self, service: UpnpService, state_variables: Sequence[UpnpStateVariable]) -> None:
+        """Forward events; an empty event means a resubscription failed."""
+        if not state_variables:
+            _LOGGER.debug("DLNA subscription to %s on %s expired", service.service_id, self._host)
+            device, notify_server = self.device, self._notify_server
+            self.device = None
+            self._notify_server = None
+            # Not started eagerly: this runs inside the library's resubscribe loop, which unsubscribing would disturb
+            self._hass.async_create_task(self._async_release(device, notify_server), eager_start=False)
+            self._on_lost()
+            return
+        self._on_update()
@@ -0,0 +1,71 @@
+# /config/custom_components/akubox_controller/entity.py
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity import EntityDescription
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN, ATTR_STALE, ATTR_LAST_SUCCESSFUL_UPDATE
+from .coordinator import AkuBoxDataUpdateCoordinator
+
+
+def build_device_info(entry: ConfigEntry, system_info: dict[str, Any]) -> DeviceInfo:
+    """Build the one DeviceInfo shared by every entity of an entry."""
+    system = system_info.get("system") or {}
+    device_info = DeviceInfo(
+        identifiers={(DOMAIN, entry.unique_id or entry.entry_id)},
+        name=entry.title, # Use the ConfigEntry title as the device name
+        manufacturer="AkuBox Custom",
+        model="AkuBox Controller",
+    )
+    if sw_version := system.get("go_version"):
+        device_info["sw_version"] = sw_version
+    if os_name := system.get("os"):
+        device_info["hw_version"] = f"{os_name}/{system.get('architecture', 'N/A')}"
+    return device_info
+
+
+class AkuBoxCoordinatorEntity(CoordinatorEntity):
+    """Base for entities fed by an AkuBox coordinator.
+
+    Static metadata lives in a shared EntityDescription and the DeviceInfo is
+    shared per entry, so an instance only holds its description and coordinator.
+
+    A failed poll does not make the entity unavailable right away: the last good
+    data is served, flagged as stale, until the coordinator's grace window runs out.
+    """
+
+    coordinator: AkuBoxDataUpdateCoordinator
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: AkuBoxDataUpdateCoordinator,
+        description: EntityDescription,
+        device_info: DeviceInfo,
+    ) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_device_info = device_info
+
+    @property
+    def unique_id(self) -> str:
+        """Return the host based unique ID."""
+        return f"{self.coordinator.config_entry.unique_id}_{self.entity_description.key}"
+
+    @property
+    def available(self) -> bool:
+        """Return True while the coordinator has fresh or still-acceptable stale data."""
+        return self.coordinator.data_available
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Mark values that come from the last successful poll."""
+        if not self.coordinator.is_stale:
+            return None
+        return {
+            ATTR_STALE: True,
+            ATTR_LAST_SUCCESSFUL_UPDATE: self.coordinator.last_data_time,
+        }
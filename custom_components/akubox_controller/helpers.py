@@ -0,0 +1,29 @@
+# /config/custom_components/akubox_controller/helpers.py
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import device_registry as dr
+
+from .const import DOMAIN
+
+
+@callback
+def async_get_target_entry_ids(hass: HomeAssistant, device_ids: list[str] | None) -> list[str]:
+    """Return the loaded entry ids for the given devices, or all loaded entries.
+
+    Shared by the services and the websocket API; raises HomeAssistantError for
+    an unknown device or one that is not a loaded AkuBox device.
+    """
+    loaded = hass.data.get(DOMAIN, {})
+    if not device_ids:
+        return list(loaded)
+    registry = dr.async_get(hass)
+    entry_ids: list[str] = []
+    for device_id in device_ids:
+        device = registry.async_get(device_id)
+        if device is None:
+            raise HomeAssistantError(f"Unknown device: {device_id}")
+        matches = [entry_id for entry_id in device.config_entries if entry_id in loaded]
+        if not matches:
+            raise HomeAssistantError(f"Device {device_id} is not a loaded AkuBox device")
+        entry_ids.extend(entry_id for entry_id in matches if entry_id not in entry_ids)
+    return entry_ids
@@ -1,29 +1,44 @@
 # /config/custom_components/akubox_controller/media_player.py
 import logging
-from datetime import timedelta
+
+from datetime import datetime
+
+from async_upnp_client.profiles.dlna import DmrDevice, TransportState
 
 from homeassistant.components.media_player import (
     MediaPlayerEntity,
+    MediaPlayerEntityDescription,
     MediaPlayerEntityFeature,
     MediaPlayerState,
+    MediaType,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-    DataUpdateCoordinator,
-    UpdateFailed,
-)
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.const import STATE_IDLE, CONF_HOST
 
-from .const import DOMAIN, UPDATE_INTERVAL_VOLUME # DEFAULT_NAME no longer needed here
+from .const import DOMAIN, MEDIA_PLAYER_VOLUME, DLNA_RETRY_INTERVAL # DEFAULT_NAME no longer needed here
 from .api import AkuBoxApiClient, AkuBoxApiError, DEVICE_VOLUME_MAX
+from .dlna import AkuBoxDlnaListener
+from .entity import AkuBoxCoordinatorEntity
 
 _LOGGER = logging.getLogger(__name__)
 
 SUPPORT_AKUBOX = MediaPlayerEntityFeature.VOLUME_SET | MediaPlayerEntityFeature.VOLUME_STEP
 
+TRANSPORT_STATES = {
+    TransportState.PLAYING: MediaPlayerState.PLAYING,
+    TransportState.TRANSITIONING: MediaPlayerState.PLAYING,
+    TransportState.PAUSED_PLAYBACK: MediaPlayerState.PAUSED,
+    TransportState.PAUSED_RECORDING: MediaPlayerState.PAUSED,
+}
+
+VOLUME_DESCRIPTION = MediaPlayerEntityDescription(key=MEDIA_PLAYER_VOLUME, name="Volume Control")
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -32,71 +47,152 @@ async def async_setup_entry(
     """Set up AkuBox media_player from a config entry."""
     akubox_data = hass.data[DOMAIN][entry.entry_id]
     client: AkuBoxApiClient = akubox_data["client"]
-    # host: str = entry.data[CONF_HOST] # entry.title is now the primary device name
-
-    volume_scan_interval = entry.options.get(
-        "scan_interval_volume", UPDATE_INTERVAL_VOLUME
-    )
-
-    coordinator_name = f"{entry.title} Volume" # Use entry.title for coordinator name
-    volume_coordinator = DataUpdateCoordinator(
-        hass,
-        _LOGGER,
-        name=coordinator_name,
-        update_method=client.get_volume,
-        update_interval=timedelta(seconds=volume_scan_interval),
-    )
-
-    await volume_coordinator.async_config_entry_first_refresh()
-
-    device_info = {
-        "identifiers": {(DOMAIN, entry.unique_id or entry.entry_id)},
-        "name": entry.title, # Use the ConfigEntry title as the device name
-        "manufacturer": "AkuBox Custom",
-        "model": "AkuBox Controller (Media)", # Specific model for media player part
-    }
-    # Try to populate sw_version and hw_version
-    try:
-        system_info_for_versions = await client.get_system_info()
-        if sw_version := system_info_for_versions.get("system", {}).get("go_version"):
-            device_info["sw_version"] = sw_version
-        if os_name := system_info_for_versions.get("system", {}).get("os"):
-            arch = system_info_for_versions.get('system', {}).get('architecture', 'N/A')
-            device_info["hw_version"] = f"{os_name}/{arch}"
-    except AkuBoxApiError as err:
-        _LOGGER.warning("Could not fetch system_info for version details for %s media_player: %s", entry.title, err)
-
-
-    async_add_entities([AkuBoxMediaPlayer(volume_coordinator, client, entry, device_info)])
-
-
-class AkuBoxMediaPlayer(CoordinatorEntity, MediaPlayerEntity):
+    # Created in __init__ so /api/volume/get is not polled while the media player is disabled
+    volume_coordinator: DataUpdateCoordinator | None = akubox_data["volume_coordinator"]
+    if volume_coordinator is None:
+        _LOGGER.debug("%s has no volume endpoint, not adding a media player", entry.title)
+        return
+
+    async_add_entities([AkuBoxMediaPlayer(volume_coordinator, client, entry, akubox_data["device_info"])])
+
+
+class AkuBoxMediaPlayer(AkuBoxCoordinatorEntity, MediaPlayerEntity):
     """Representation of an AkuBox Media Player (for volume control)."""
 
     _attr_supported_features = SUPPORT_AKUBOX
-    _attr_has_entity_name = True # Name will be "Volume Control"
 
     def __init__(
         self,
         coordinator: DataUpdateCoordinator,
         client: AkuBoxApiClient,
-        config_entry: ConfigEntry, # Keep for unique_id
-        device_info: dict,
+        config_entry: ConfigEntry,
+        device_info: DeviceInfo,
     ):
         """Initialize the media player."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, VOLUME_DESCRIPTION, device_info)
         self._client = client
-        self._attr_name = "Volume Control" # This is the entity specific name
-        self._attr_unique_id = f"{config_entry.unique_id}_mediaplayer_volume"
-        self._attr_device_info = device_info # This links to the device named by entry.title
         self._attr_volume_level: float | None = None
         self._attr_state = STATE_IDLE
+        self._host: str = config_entry.data[CONF_HOST]
+        self._dlna: AkuBoxDlnaListener | None = None
+        self._cancel_dlna_retry = None
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to DLNA events in the background; polling covers the volume until then."""
+        await super().async_added_to_hass()
+        self._dlna = AkuBoxDlnaListener(self.hass, self._host, self._on_dlna_event, self._on_dlna_lost)
+        self.hass.async_create_task(self._async_start_dlna())
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Drop the DLNA subscription."""
+        if self._cancel_dlna_retry is not None:
+            self._cancel_dlna_retry()
+            self._cancel_dlna_retry = None
+        if self._dlna is not None:
+            dlna, self._dlna = self._dlna, None
+            await dlna.async_stop()
+        self.coordinator.async_set_push_active(False)
+        await super().async_will_remove_from_hass()
+
+    async def _async_start_dlna(self, _now: datetime | None = None) -> None:
+        """Subscribe, or try again after DLNA_RETRY_INTERVAL (e.g. while DLNA is switched off)."""
+        self._cancel_dlna_retry = None
+        if self._dlna is None:
+            return
+        if not await self._dlna.async_start():
+            if self._dlna is not None:
+                self._cancel_dlna_retry = async_call_later(self.hass, DLNA_RETRY_INTERVAL, self._async_start_dlna)
+            return
+        self.coordinator.async_set_push_active(True)
+        self._on_dlna_event()
+
+    @callback
+    def _on_dlna_event(self) -> None:
+        """Feed pushed volume into the coordinator and write playback state."""
+        if (device := self._dlna_device) is None:
+            return
+        if device.volume_level is not None and self.coordinator.data is not None:
+            api_volume = round(device.volume_level * DEVICE_VOLUME_MAX)
+            if api_volume != self.coordinator.data.get("volume"):
+                # Coordinator listeners (this entity included) write state from here
+                self.coordinator.async_set_updated_data({**self.coordinator.data, "volume": api_volume})
+                return
+        self.async_write_ha_state()
+
+    @callback
+    def _on_dlna_lost(self) -> None:
+        """Fall back to polling until the subscription is re-established."""
+        self.coordinator.async_set_push_active(False)
+        self.async_write_ha_state()
+        if self._cancel_dlna_retry is None:
+            self._cancel_dlna_retry = async_call_later(self.hass, DLNA_RETRY_INTERVAL, self._async_start_dlna)
+
+    @property
+    def _dlna_device(self) -> DmrDevice | None:
+        """Return the subscribed renderer, or None while polling."""
+        return self._dlna.device if self._dlna else None
 
     @property
     def state(self) -> MediaPlayerState:
         """Return the state of the player."""
+        if (device := self._dlna_device) is not None and device.transport_state is not None:
+            return TRANSPORT_STATES.get(device.transport_state, MediaPlayerState.IDLE)
         return self._attr_state
 
+    @property
+    def is_volume_muted(self) -> bool | None:
+        """Return the mute state reported by the renderer."""
+        device = self._dlna_device
+        return device.is_volume_muted if device is not None else None
+
+    @property
+    def media_content_type(self) -> MediaType | None:
+        """Content type of the current track."""
+        device = self._dlna_device
+        return MediaType.MUSIC if device is not None and device.media_title else None
+
+    @property
+    def media_title(self) -> str | None:
+        """Title of the current track."""
+        device = self._dlna_device
+        return device.media_title if device is not None else None
+
+    @property
+    def media_artist(self) -> str | None:
+        """Artist of the current track."""
+        device = self._dlna_device
+        return device.media_artist if device is not None else None
+
+    @property
+    def media_album_name(self) -> str | None:
+        """Album of the current track."""
+        device = self._dlna_device
+        return device.media_album_name if device is not None else None
+
+    @property
+    def media_image_url(self) -> str | None:
+        """Cover art of the current track."""
+        device = self._dlna_device
+        return device.media_image_url if device is not None else None
+
+    @property
+    def media_duration(self) -> int | None:
+        """Duration of the current track in seconds."""
+        device = self._dlna_device
+        return device.media_duration if device is not None else None
+
+    @property
+    def media_position(self) -> int | None:
+        """Playback position, as of media_position_updated_at."""
+        device = self._dlna_device
+        return device.media_position if device is not None else None
+
+    @property
+    def media_position_updated_at(self) -> datetime | None:
+        """When media_position was last reported."""
+        device = self._dlna_device
+        return device.media_position_updated_at if device is not None else None
+
     @property
     def volume_level(self) -> float | None:
         """Volume level of the media player (0..1)."""
@@ -0,0 +1,150 @@
+# /config/custom_components/akubox_controller/metrics.py
+import logging
+from datetime import datetime
+from typing import Any
+
+from aiohttp import web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, CONF_HOST, METRICS_URL
+from .api import AkuBoxApiClient
+
+_LOGGER = logging.getLogger(__name__)
+
+CONTENT_TYPE_PROMETHEUS = "text/plain; version=0.0.4; charset=utf-8"
+
+# name -> (type, help)
+METRICS = {
+    "akubox_up": ("gauge", "Whether the last system info poll succeeded."),
+    "akubox_cpu_usage_percent": ("gauge", "CPU usage in percent."),
+    "akubox_cpu_count": ("gauge", "Number of CPUs."),
+    "akubox_memory_used_bytes": ("gauge", "Used memory in bytes."),
+    "akubox_memory_total_bytes": ("gauge", "Total memory in bytes."),
+    "akubox_battery_level_percent": ("gauge", "Battery capacity in percent."),
+    "akubox_goroutines": ("gauge", "Number of Go goroutines."),
+    "akubox_start_time_seconds": ("gauge", "Device start time as a Unix timestamp."),
+    "akubox_volume": ("gauge", "Device volume (0-63)."),
+    "akubox_client_requests_total": ("counter", "HTTP requests sent to the device."),
+    "akubox_client_timeouts_total": ("counter", "HTTP requests that timed out."),
+    "akubox_client_connection_errors_total": ("counter", "HTTP requests that failed to connect."),
+    "akubox_client_retries_total": ("counter", "Retried idempotent GETs."),
+    "akubox_client_hedges_total": ("counter", "Hedged idempotent GETs."),
+    "akubox_client_oversized_responses_total": ("counter", "Responses discarded for exceeding the endpoint size limit."),
+    "akubox_client_request_timeout_seconds": ("gauge", "Current adaptive request timeout per port."),
+}
+
+
+def _escape(value: Any) -> str:
+    """Escape a Prometheus label value."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _start_timestamp(start_time: str | None) -> float | None:
+    if not start_time:
+        return None
+    try:
+        return datetime.fromisoformat(start_time).timestamp()
+    except ValueError:
+        return None
+
+
+def device_metrics(akubox_data: dict[str, Any]) -> dict[str, Any]:
+    """Return the device gauges of one entry from the coordinators' in-memory data."""
+    system = akubox_data["system_coordinator"].data or {}
+    cpu = system.get("cpu") or {}
+    memory = system.get("memory") or {}
+    battery = system.get("battery") or {}
+    system_section = system.get("system") or {}
+    values = {
+        "akubox_cpu_usage_percent": cpu.get("usage"),
+        "akubox_cpu_count": cpu.get("num_cpu"),
+        "akubox_memory_used_bytes": memory.get("used"),
+        "akubox_memory_total_bytes": memory.get("total"),
+        "akubox_battery_level_percent": battery.get("capacity"),
+        "akubox_goroutines": system_section.get("num_goroutine"),
+        "akubox_start_time_seconds": _start_timestamp(system_section.get("start_time")),
+    }
+    if (volume_coordinator := akubox_data["volume_coordinator"]) is not None:
+        values["akubox_volume"] = (volume_coordinator.data or {}).get("volume")
+    return {name: value for name, value in values.items() if value is not None}
+
+
+def render_metrics(hass: HomeAssistant) -> str:
+    """Render metrics for every loaded AkuBox entry from in-memory data only."""
+    samples: dict[str, list[str]] = {name: [] for name in METRICS}
+
+    def add(name: str, labels: str, value: Any) -> None:
+        if isinstance(value, bool):
+            value = int(value)
+        if isinstance(value, (int, float)):
+            samples[name].append(f"{name}{{{labels}}} {value}")
+
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        akubox_data = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+        if not akubox_data:
+            continue
+        labels = f'host="{_escape(entry.data[CONF_HOST])}",name="{_escape(entry.title)}"'
+
+        system_coordinator = akubox_data["system_coordinator"]
+        if system_coordinator.data is not None:
+            add("akubox_up", labels, system_coordinator.last_update_success)
+        for name, value in device_metrics(akubox_data).items():
+            add(name, labels, value)
+
+        client: AkuBoxApiClient = akubox_data["client"]
+        stats = client.request_stats
+        for counter in ("requests", "timeouts", "connection_errors", "retries", "hedges", "oversized_responses"):
+            add(f"akubox_client_{counter}_total", labels, stats.get(counter, 0))
+        for base_url, timeout in client.request_timeouts.items():
+            port = base_url.rsplit(":", 1)[1] if base_url.count(":") > 1 else "80"
+            add("akubox_client_request_timeout_seconds", f'{labels},port="{port}"', round(timeout, 3))
+
+    lines: list[str] = []
+    for name, (metric_type, help_text) in METRICS.items():
+        if not samples[name]:
+            continue
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        lines.extend(samples[name])
+    return "\n".join(lines) + "\n"
+
+
+class AkuBoxMetricsView(HomeAssistantView):
+    """Serve AkuBox metrics in Prometheus text format."""
+
+    url = METRICS_URL
+    name = "api:akubox_controller:metrics"
+    requires_auth = True
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the view."""
+        self._hass = hass
+        self._cache_key: tuple | None = None
+        self._cache_text = ""
+
+    def _current_key(self) -> tuple:
+        """Return a key that changes whenever any coordinator has new data."""
+        key = []
+        for entry_id, akubox_data in self._hass.data.get(DOMAIN, {}).items():
+            system_coordinator = akubox_data["system_coordinator"]
+            volume_coordinator = akubox_data["volume_coordinator"]
+            key.append((
+                entry_id,
+                system_coordinator.data_version,
+                system_coordinator.last_update_success,
+                volume_coordinator.data_version if volume_coordinator is not None else None,
+            ))
+        return tuple(key)
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the cached metrics, re-rendering only after a coordinator update."""
+        key = self._current_key()
+        if key != self._cache_key:
+            self._cache_text = render_metrics(self._hass)
+            self._cache_key = key
+        return web.Response(
+            body=self._cache_text.encode("utf-8"),
+            headers={"Content-Type": CONTENT_TYPE_PROMETHEUS},
+        )
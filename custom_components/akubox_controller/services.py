@@ -0,0 +1,200 @@
+# /config/custom_components/akubox_controller/services.py
+import asyncio
+import logging
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    SWITCHES,
+    SWITCH_DLNA,
+    SWITCH_LED_LOGO,
+    SERVICE_SNAPSHOT,
+    SERVICE_RESTORE,
+    ATTR_SNAPSHOT_ID,
+    ATTR_MAX_AGE,
+    ATTR_PERSIST,
+    DEFAULT_SNAPSHOT_ID,
+    DEFAULT_SNAPSHOT_MAX_AGE,
+    DEFAULT_RESTORE_MAX_AGE,
+    SNAPSHOT_STORAGE_KEY,
+    SNAPSHOT_STORAGE_VERSION,
+)
+from .api import AkuBoxApiClient
+from .helpers import async_get_target_entry_ids
+
+_LOGGER = logging.getLogger(__name__)
+
+SNAPSHOT_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(ATTR_SNAPSHOT_ID, default=DEFAULT_SNAPSHOT_ID): cv.string,
+    vol.Optional(ATTR_MAX_AGE, default=DEFAULT_SNAPSHOT_MAX_AGE): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    vol.Optional(ATTR_PERSIST, default=False): cv.boolean,
+})
+
+RESTORE_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(ATTR_SNAPSHOT_ID, default=DEFAULT_SNAPSHOT_ID): cv.string,
+    # Compare against a live read: the volume is often changed by other controllers between polls
+    vol.Optional(ATTR_MAX_AGE, default=DEFAULT_RESTORE_MAX_AGE): vol.All(vol.Coerce(float), vol.Range(min=0)),
+})
+
+
+async def _async_read_state(akubox_data: dict[str, Any], max_age: float) -> dict[str, Any]:
+    """Read volume and switch states, preferring coordinator data younger than max_age or confirmed by push."""
+    client: AkuBoxApiClient = akubox_data["client"]
+
+    async def _volume() -> int | None:
+        if (volume_coordinator := akubox_data["volume_coordinator"]) is None:
+            return None
+        data = volume_coordinator.async_fresh_data(max_age)
+        if data is None:
+            data = await client.get_volume()
+        return data.get("volume")
+
+    async def _switches() -> dict[str, bool | None]:
+        supported = [switch_type for switch_type in SWITCHES if akubox_data["capabilities"][switch_type]]
+        switch_coordinator = akubox_data["switch_coordinator"]
+        fresh = switch_coordinator.async_fresh_data(max_age) if switch_coordinator is not None else None
+        data = dict(fresh or {})
+        if missing := [switch_type for switch_type in supported if switch_type not in data]:
+            data.update(await client.get_switch_states(missing))
+        return {switch_type: data.get(switch_type) for switch_type in SWITCHES}
+
+    volume, switch_states = await asyncio.gather(_volume(), _switches())
+    return {"volume": volume, **switch_states}
+
+
+async def _async_apply_state(akubox_data: dict[str, Any], target: dict[str, Any], max_age: float) -> list[str]:
+    """Write only the values that differ from the device's current state.
+
+    Every write is attempted; if any fail, the successful ones are still applied
+    and a HomeAssistantError naming the failed values is raised afterwards.
+    """
+    client: AkuBoxApiClient = akubox_data["client"]
+    current = await _async_read_state(akubox_data, max_age)
+    writes = []
+    changed: list[str] = []
+    # Values the device does not support read as None and are skipped
+    if target.get("volume") is not None and current["volume"] is not None and target["volume"] != current["volume"]:
+        writes.append(client.set_volume(target["volume"]))
+        changed.append("volume")
+    setters = {SWITCH_DLNA: client.set_dlna_state, SWITCH_LED_LOGO: client.set_led_logo_state}
+    for switch_type, setter in setters.items():
+        if target.get(switch_type) is not None and current[switch_type] is not None and target[switch_type] != current[switch_type]:
+            writes.append(setter(target[switch_type]))
+            changed.append(switch_type)
+    results = await asyncio.gather(*writes, return_exceptions=True)
+    errors = {key: result for key, result in zip(changed, results) if isinstance(result, BaseException)}
+    for error in errors.values():
+        if not isinstance(error, Exception):
+            raise error
+    changed = [key for key in changed if key not in errors]
+
+    # Push the values that were written into the coordinators so entities update without a poll,
+    # even when another write failed
+    volume_coordinator = akubox_data["volume_coordinator"]
+    if "volume" in changed and volume_coordinator is not None and volume_coordinator.data is not None:
+        volume_coordinator.async_set_updated_data({**volume_coordinator.data, "volume": target["volume"]})
+    switch_coordinator = akubox_data["switch_coordinator"]
+    if switch_coordinator is not None and switch_coordinator.data is not None and (
+        switch_changes := {t: target[t] for t in changed if t in switch_coordinator.data}
+    ):
+        switch_coordinator.async_set_updated_data({**switch_coordinator.data, **switch_changes})
+    if errors:
+        raise HomeAssistantError(
+            "; ".join(f"{key}: {error}" for key, error in errors.items())
+            + (f" (restored {', '.join(changed)})" if changed else "")
+        )
+    return changed
+
+
+class AkuBoxSnapshots:
+    """Named fleet snapshots of volume, DLNA and LED logo state."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the snapshot holder."""
+        self._hass = hass
+        self._store: Store = Store(hass, SNAPSHOT_STORAGE_VERSION, SNAPSHOT_STORAGE_KEY)
+        self._snapshots: dict[str, dict[str, dict[str, Any]]] = {}
+        self._persisted: set[str] = set()
+        self._loaded = False
+
+    async def _async_load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if stored := await self._store.async_load():
+            for snapshot_id, snapshot in stored.items():
+                self._snapshots.setdefault(snapshot_id, snapshot)
+                self._persisted.add(snapshot_id)
+
+    async def async_snapshot(self, call: ServiceCall) -> None:
+        """Capture the state of the targeted devices."""
+        await self._async_load()
+        snapshot_id = call.data[ATTR_SNAPSHOT_ID]
+        entry_ids = async_get_target_entry_ids(self._hass, call.data.get(ATTR_DEVICE_ID))
+        loaded = self._hass.data[DOMAIN]
+        results = await asyncio.gather(
+            *(_async_read_state(loaded[entry_id], call.data[ATTR_MAX_AGE]) for entry_id in entry_ids),
+            return_exceptions=True,
+        )
+        snapshot: dict[str, dict[str, Any]] = {}
+        for entry_id, result in zip(entry_ids, results):
+            if isinstance(result, Exception):
+                _LOGGER.warning("Could not snapshot AkuBox %s: %s", loaded[entry_id]["host"], result)
+                continue
+            snapshot[entry_id] = result
+        self._snapshots[snapshot_id] = snapshot
+        _LOGGER.debug("Captured snapshot %s for %s devices", snapshot_id, len(snapshot))
+
+        # Only touch storage when this snapshot is or was persisted
+        if call.data[ATTR_PERSIST] or snapshot_id in self._persisted:
+            if call.data[ATTR_PERSIST]:
+                self._persisted.add(snapshot_id)
+            else:
+                self._persisted.discard(snapshot_id)
+            await self._store.async_save({key: self._snapshots[key] for key in self._persisted})
+
+    async def async_restore(self, call: ServiceCall) -> None:
+        """Restore the targeted devices from a snapshot, writing only differing values."""
+        await self._async_load()
+        snapshot_id = call.data[ATTR_SNAPSHOT_ID]
+        if (snapshot := self._snapshots.get(snapshot_id)) is None:
+            raise HomeAssistantError(f"Unknown AkuBox snapshot: {snapshot_id}")
+        loaded = self._hass.data[DOMAIN]
+        entry_ids = [
+            entry_id for entry_id in async_get_target_entry_ids(self._hass, call.data.get(ATTR_DEVICE_ID))
+            if entry_id in snapshot
+        ]
+        results = await asyncio.gather(
+            *(
+                _async_apply_state(loaded[entry_id], snapshot[entry_id], call.data[ATTR_MAX_AGE])
+                for entry_id in entry_ids
+            ),
+            return_exceptions=True,
+        )
+        failed = []
+        for entry_id, result in zip(entry_ids, results):
+            host = loaded[entry_id]["host"]
+            if isinstance(result, Exception):
+                _LOGGER.error("Could not restore AkuBox %s: %s", host, result)
+                failed.append(host)
+            else:
+                _LOGGER.debug("Restored %s on AkuBox %s", result or "nothing", host)
+        if failed:
+            raise HomeAssistantError(f"Failed to restore snapshot {snapshot_id} on: {', '.join(failed)}")
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the snapshot and restore services."""
+    snapshots = AkuBoxSnapshots(hass)
+    hass.services.async_register(DOMAIN, SERVICE_SNAPSHOT, snapshots.async_snapshot, schema=SNAPSHOT_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_RESTORE, snapshots.async_restore, schema=RESTORE_SCHEMA)
@@ -1,24 +1,55 @@
 # /config/custom_components/akubox_controller/switch.py
 import logging
-import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
 from typing import Any
 
-from homeassistant.components.switch import SwitchEntity, SwitchDeviceClass
+from homeassistant.components.switch import SwitchEntity, SwitchEntityDescription, SwitchDeviceClass
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.const import CONF_HOST # Import CONF_HOST
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .const import (
     DOMAIN,
-    # DEFAULT_NAME, # No longer needed here
     SWITCH_DLNA,
     SWITCH_LED_LOGO,
 )
-from .api import AkuBoxApiClient, AkuBoxApiError, AkuBoxApiConnectionError
+from .api import AkuBoxApiClient, AkuBoxApiError
+from .entity import AkuBoxCoordinatorEntity
 
 _LOGGER = logging.getLogger(__name__)
 
+
+@dataclass(frozen=True, kw_only=True)
+class AkuBoxSwitchEntityDescription(SwitchEntityDescription):
+    """Describes an AkuBox switch; set_fn writes its state to the device."""
+
+    set_fn: Callable[[AkuBoxApiClient, bool], Awaitable[Any]]
+    icon_off: str | None = None # Icon while off, when it differs from icon
+
+
+SWITCH_DESCRIPTIONS: tuple[AkuBoxSwitchEntityDescription, ...] = (
+    AkuBoxSwitchEntityDescription(
+        key=SWITCH_DLNA,
+        name="DLNA 服务",
+        icon="mdi:dlna",
+        device_class=SwitchDeviceClass.SWITCH,
+        set_fn=lambda client, state: client.set_dlna_state(state),
+    ),
+    AkuBoxSwitchEntityDescription(
+        key=SWITCH_LED_LOGO,
+        name="LED Logo 灯",
+        icon="mdi:led-on",
+        icon_off="mdi:led-off",
+        device_class=SwitchDeviceClass.SWITCH,
+        set_fn=lambda client, state: client.set_led_logo_state(state),
+    ),
+)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -26,129 +57,71 @@ async def async_setup_entry(
 ) -> None:
     """Set up AkuBox switches from a config entry."""
     akubox_data = hass.data[DOMAIN][entry.entry_id]
-    client: AkuBoxApiClient = akubox_data["client"]
-    # host: str = entry.data[CONF_HOST] # entry.title is now the primary device name
-
-    device_info = {
-        "identifiers": {(DOMAIN, entry.unique_id or entry.entry_id)},
-        "name": entry.title, # Use the ConfigEntry title as the device name
-        "manufacturer": "AkuBox Custom",
-        "model": "AkuBox Controller", # Can be more specific if needed
-    }
-    # Try to populate sw_version and hw_version
-    try:
-        system_info_for_versions = await client.get_system_info()
-        if sw_version := system_info_for_versions.get("system", {}).get("go_version"):
-            device_info["sw_version"] = sw_version
-        if os_name := system_info_for_versions.get("system", {}).get("os"):
-            arch = system_info_for_versions.get('system', {}).get('architecture', 'N/A')
-            device_info["hw_version"] = f"{os_name}/{arch}"
-    except AkuBoxApiError as err:
-        _LOGGER.warning("Could not fetch system_info for version details for %s switches: %s", entry.title, err)
-
-    switches_to_add = [
-        AkuBoxSwitch(client, entry, device_info, SWITCH_DLNA, "DLNA 服务", "mdi:dlna"),
-        AkuBoxSwitch(client, entry, device_info, SWITCH_LED_LOGO, "LED Logo 灯", "mdi:led-on"),
-    ]
-
-    if switches_to_add:
-        _LOGGER.info("Attempting initial update for %s switches for %s before adding to Home Assistant.", len(switches_to_add), entry.title)
-        update_tasks = [switch_entity.async_update() for switch_entity in switches_to_add]
-        try:
-            await asyncio.gather(*update_tasks)
-            _LOGGER.info("Initial update for switches for %s completed.", entry.title)
-        except Exception as e:
-            _LOGGER.error("Error during initial gather of switch updates for %s: %s", entry.title, e, exc_info=True)
+    # Created in __init__ so its interval can be changed from the options without a reload
+    switch_coordinator: DataUpdateCoordinator | None = akubox_data["switch_coordinator"]
+    if switch_coordinator is None:
+        _LOGGER.debug("%s does not answer on the switch port, not adding switches", entry.title)
+        return
 
-    async_add_entities(switches_to_add)
+    capabilities = akubox_data["capabilities"]
+    async_add_entities(
+        AkuBoxSwitch(switch_coordinator, akubox_data["client"], description, akubox_data["device_info"])
+        for description in SWITCH_DESCRIPTIONS
+        if capabilities[description.key]
+    )
 
 
-class AkuBoxSwitch(SwitchEntity):
+class AkuBoxSwitch(AkuBoxCoordinatorEntity, SwitchEntity):
     """Representation of an AkuBox Switch."""
 
-    _attr_should_poll = True
-    _attr_has_entity_name = True # Name will be "DLNA 服务" or "LED Logo 灯"
+    entity_description: AkuBoxSwitchEntityDescription
 
     def __init__(
         self,
+        coordinator: DataUpdateCoordinator,
         client: AkuBoxApiClient,
-        config_entry: ConfigEntry, # Keep for unique_id
-        device_info: dict,
-        switch_type: str,
-        name_suffix: str, # This becomes the entity name
-        default_icon: str,
+        description: AkuBoxSwitchEntityDescription,
+        device_info: DeviceInfo,
     ):
         """Initialize the switch."""
+        super().__init__(coordinator, description, device_info)
         self._client = client
-        self._switch_type = switch_type
-
-        self._attr_unique_id = f"{config_entry.unique_id}_{switch_type}"
-        self._attr_name = name_suffix # Set entity name directly
-        self._attr_device_info = device_info # Links to device named by entry.title
-        self._default_icon = default_icon
-        self._attr_is_on: bool | None = None
-        self._attr_available = True # Assume available until first update
-        self.entity_id = f"switch.{DOMAIN}_{config_entry.unique_id}_{switch_type}".lower()
-
+        self.entity_id = f"switch.{DOMAIN}_{coordinator.config_entry.unique_id}_{description.key}".lower()
 
     @property
     def icon(self) -> str | None:
         """Return the icon to use in the frontend, if any."""
-        if self._switch_type == SWITCH_LED_LOGO:
-            return "mdi:led-on" if self.is_on else "mdi:led-off"
-        return self._default_icon
+        if self.entity_description.icon_off is not None and not self.is_on:
+            return self.entity_description.icon_off
+        return self.entity_description.icon
 
     @property
-    def device_class(self) -> SwitchDeviceClass | None:
-        """Return the class of this entity."""
-        return SwitchDeviceClass.SWITCH
-
-    async def async_update(self) -> None:
-        """Fetch new state data for the switch."""
-        _LOGGER.debug("Attempting to update state for switch %s (%s)", self._attr_name, self.entity_id)
+    def is_on(self) -> bool | None:
+        """Return true if the switch is on."""
+        if self.coordinator.data is None:
+            return None
+        return self.coordinator.data.get(self.entity_description.key)
+
+    def _set_local_state(self, state: bool) -> None:
+        """Store a confirmed state in the coordinator so every listener sees it."""
+        self.coordinator.async_set_updated_data(
+            {**(self.coordinator.data or {}), self.entity_description.key: state}
+        )
+
+    async def _async_set_state(self, state: bool) -> None:
+        """Write the state; a failed command leaves availability to the next poll."""
         try:
-            if self._switch_type == SWITCH_DLNA:
-                self._attr_is_on = await self._client.get_dlna_state()
-            elif self._switch_type == SWITCH_LED_LOGO:
-                self._attr_is_on = await self._client.get_led_logo_state()
-            self._attr_available = True
-            _LOGGER.debug("Successfully updated state for switch %s (%s): is_on=%s", self._attr_name, self.entity_id, self._attr_is_on)
-        except AkuBoxApiConnectionError as err:
-            _LOGGER.warning("Connection error fetching state for switch %s (%s): %s. Marking as unavailable.", self._attr_name, self.entity_id, err)
-            self._attr_available = False
+            await self.entity_description.set_fn(self._client, state)
         except AkuBoxApiError as err:
-            _LOGGER.error("API error fetching state for switch %s (%s): %s. Marking as unavailable.", self._attr_name, self.entity_id, err)
-            self._attr_available = False
-        except Exception as err: # pylint: disable=broad-except
-            _LOGGER.exception("Unexpected error fetching state for switch %s (%s). Marking as unavailable.", self._attr_name, self.entity_id)
-            self._attr_available = False
+            raise HomeAssistantError(
+                f"Failed to turn {'on' if state else 'off'} {self.entity_description.name} on {self._client.host}: {err}"
+            ) from err
+        self._set_local_state(state)
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the switch on."""
-        try:
-            if self._switch_type == SWITCH_DLNA:
-                await self._client.set_dlna_state(True)
-            elif self._switch_type == SWITCH_LED_LOGO:
-                await self._client.set_led_logo_state(True)
-            self._attr_is_on = True
-            self._attr_available = True
-        except AkuBoxApiError as e:
-            _LOGGER.error("Error turning on %s (%s): %s", self._attr_name, self.entity_id, e)
-            self._attr_available = False # Assume unavailable on error
-        finally:
-            self.async_write_ha_state()
+        await self._async_set_state(True)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the switch off."""
-        try:
-            if self._switch_type == SWITCH_DLNA:
-                await self._client.set_dlna_state(False)
-            elif self._switch_type == SWITCH_LED_LOGO:
-                await self._client.set_led_logo_state(False)
-            self._attr_is_on = False
-            self._attr_available = True
-        except AkuBoxApiError as e:
-            _LOGGER.error("Error turning off %s (%s): %s", self._attr_name, self.entity_id, e)
-            self._attr_available = False # Assume unavailable on error
-        finally:
-            self.async_write_ha_state()
+        await self._async_set_state(False)
@@ -0,0 +1,161 @@
+# /config/custom_components/akubox_controller/websocket_api.py
+import logging
+import time
+from datetime import datetime
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+    DOMAIN,
+    WS_TYPE_SUBSCRIBE_METRICS,
+    WS_DEFAULT_MIN_INTERVAL,
+    WS_MIN_INTERVAL,
+    SIGNAL_ENTRY_SETUP,
+)
+from .metrics import device_metrics
+from .helpers import async_get_target_entry_ids
+
+_LOGGER = logging.getLogger(__name__)
+
+ATTR_MIN_INTERVAL = "min_interval"
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the live metrics subscription."""
+    websocket_api.async_register_command(hass, ws_subscribe_metrics)
+
+
+class _DeviceStream:
+    """Forward one entry's metrics to one subscriber, at most once per min_interval."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        connection: websocket_api.ActiveConnection,
+        msg_id: int,
+        entry_id: str,
+        min_interval: float,
+    ) -> None:
+        self._hass = hass
+        self._connection = connection
+        self._msg_id = msg_id
+        self._entry_id = entry_id
+        self._min_interval = min_interval
+        self._sent_at = 0.0
+        self._cancel_pending: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_send(self) -> None:
+        """Send now, or once the throttle window ends; updates in between are coalesced."""
+        if self._cancel_pending is not None:
+            return
+        wait = self._min_interval - (time.monotonic() - self._sent_at)
+        if wait > 0:
+            self._cancel_pending = async_call_later(self._hass, wait, self._async_send_pending)
+            return
+        if (akubox_data := self._hass.data[DOMAIN].get(self._entry_id)) is None:
+            return
+        self._sent_at = time.monotonic()
+        self._connection.send_message(
+            websocket_api.event_message(
+                self._msg_id,
+                {
+                    "entry_id": self._entry_id,
+                    "host": akubox_data["host"],
+                    "available": akubox_data["system_coordinator"].last_update_success,
+                    "metrics": device_metrics(akubox_data),
+                },
+            )
+        )
+
+    @callback
+    def _async_send_pending(self, _now: datetime) -> None:
+        self._cancel_pending = None
+        self.async_send()
+
+    @callback
+    def async_cancel(self) -> None:
+        if self._cancel_pending is not None:
+            self._cancel_pending()
+            self._cancel_pending = None
+
+
+@websocket_api.websocket_command({
+    vol.Required("type"): WS_TYPE_SUBSCRIBE_METRICS,
+    vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(ATTR_MIN_INTERVAL, default=WS_DEFAULT_MIN_INTERVAL): vol.All(
+        vol.Coerce(float), vol.Range(min=WS_MIN_INTERVAL)
+    ),
+})
+@callback
+def ws_subscribe_metrics(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Stream device metrics from coordinator data to the frontend.
+
+    While subscribed the system and volume coordinators poll faster; entity
+    state is still written at the configured intervals. A reload of an entry
+    replaces its coordinators, so the subscription re-attaches when the entry
+    is set up again.
+    """
+    device_ids = msg.get(ATTR_DEVICE_ID)
+    try:
+        entry_ids = async_get_target_entry_ids(hass, device_ids)
+    except HomeAssistantError as err:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, str(err))
+        return
+
+    streams: dict[str, _DeviceStream] = {}
+    unsubs: dict[str, list[CALLBACK_TYPE]] = {}
+
+    @callback
+    def async_attach(entry_id: str) -> _DeviceStream:
+        """Listen to the entry's current coordinators, dropping any from before a reload."""
+        for unsub in unsubs.pop(entry_id, []):
+            unsub()
+        if (stream := streams.get(entry_id)) is None:
+            stream = streams[entry_id] = _DeviceStream(
+                hass, connection, msg["id"], entry_id, msg[ATTR_MIN_INTERVAL]
+            )
+        akubox_data = hass.data[DOMAIN][entry_id]
+        unsubs[entry_id] = [
+            coordinator.async_add_metrics_listener(stream.async_send)
+            for coordinator_key in ("system_coordinator", "volume_coordinator")
+            if (coordinator := akubox_data[coordinator_key]) is not None
+        ]
+        return stream
+
+    @callback
+    def async_entry_setup(entry_id: str) -> None:
+        """Re-attach after a reload replaced the coordinators; follow new entries if untargeted."""
+        if entry_id in streams or not device_ids:
+            async_attach(entry_id).async_send()
+
+    for entry_id in entry_ids:
+        async_attach(entry_id)
+    unsub_setup = async_dispatcher_connect(hass, SIGNAL_ENTRY_SETUP, async_entry_setup)
+
+    @callback
+    def async_unsubscribe() -> None:
+        unsub_setup()
+        for entry_unsubs in unsubs.values():
+            for unsub in entry_unsubs:
+                unsub()
+        for stream in streams.values():
+            stream.async_cancel()
+        _LOGGER.debug("Live metrics subscription %s closed", msg["id"])
+
+    connection.subscriptions[msg["id"]] = async_unsubscribe
+    connection.send_result(msg["id"])
+    for stream in streams.values():
+        stream.async_send()
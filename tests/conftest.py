@@ -0,0 +1,231 @@
+"""Fixtures for the AkuBox Controller tests."""
+import itertools
+from collections.abc import AsyncIterator, Iterator
+from unittest.mock import AsyncMock, patch
+from xml.sax.saxutils import escape
+
+import pytest
+from aiohttp import ClientSession, TCPConnector, ThreadedResolver, web
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.akubox_controller.const import DOMAIN
+
+pytest_plugins = "pytest_homeassistant_custom_component"
+
+CLIENT = "custom_components.akubox_controller.api.AkuBoxApiClient"
+
+SYSTEM_INFO = {
+    "cpu": {"usage": 3.2, "num_cpu": 4},
+    "memory": {"used": 1024, "total": 2048},
+    "battery": {"capacity": None, "status": None},
+    "system": {
+        "hostname": "box1",
+        "go_version": "go1.21",
+        "start_time": "2024-01-01T00:00:00+08:00",
+        "num_goroutine": 12,
+    },
+}
+
+DESCRIPTION_XML = """<?xml version="1.0"?>
+<root xmlns="urn:schemas-upnp-org:device-1-0">
+  <specVersion><major>1</major><minor>0</minor></specVersion>
+  <device>
+    <deviceType>urn:schemas-upnp-org:device:MediaRenderer:1</deviceType>
+    <friendlyName>AkuBox</friendlyName>
+    <manufacturer>AkuBox</manufacturer>
+    <modelName>AkuBox</modelName>
+    <UDN>uuid:00000000-0000-0000-0000-000000000001</UDN>
+    <serviceList>
+      <service>
+        <serviceType>urn:schemas-upnp-org:service:RenderingControl:1</serviceType>
+        <serviceId>urn:upnp-org:serviceId:RenderingControl</serviceId>
+        <SCPDURL>/RenderingControl.xml</SCPDURL>
+        <controlURL>/RenderingControl/control</controlURL>
+        <eventSubURL>/RenderingControl/event</eventSubURL>
+      </service>
+      <service>
+        <serviceType>urn:schemas-upnp-org:service:AVTransport:1</serviceType>
+        <serviceId>urn:upnp-org:serviceId:AVTransport</serviceId>
+        <SCPDURL>/AVTransport.xml</SCPDURL>
+        <controlURL>/AVTransport/control</controlURL>
+        <eventSubURL>/AVTransport/event</eventSubURL>
+      </service>
+    </serviceList>
+  </device>
+</root>
+"""
+
+SCPD_XML = """<?xml version="1.0"?>
+<scpd xmlns="urn:schemas-upnp-org:service-1-0">
+  <specVersion><major>1</major><minor>0</minor></specVersion>
+  <actionList/>
+  <serviceStateTable>
+    <stateVariable sendEvents="yes"><name>LastChange</name><dataType>string</dataType></stateVariable>
+    {variables}
+  </serviceStateTable>
+</scpd>
+"""
+
+RENDERING_CONTROL_VARIABLES = """
+    <stateVariable sendEvents="no">
+      <name>Volume</name><dataType>ui2</dataType>
+      <allowedValueRange><minimum>0</minimum><maximum>100</maximum><step>1</step></allowedValueRange>
+    </stateVariable>
+    <stateVariable sendEvents="no"><name>Mute</name><dataType>boolean</dataType></stateVariable>
+    <stateVariable sendEvents="no"><name>A_ARG_TYPE_InstanceID</name><dataType>ui4</dataType></stateVariable>
+    <stateVariable sendEvents="no"><name>A_ARG_TYPE_Channel</name><dataType>string</dataType></stateVariable>
+"""
+
+AV_TRANSPORT_VARIABLES = """
+    <stateVariable sendEvents="no">
+      <name>TransportState</name><dataType>string</dataType>
+      <allowedValueList>
+        <allowedValue>STOPPED</allowedValue><allowedValue>PLAYING</allowedValue>
+        <allowedValue>PAUSED_PLAYBACK</allowedValue><allowedValue>NO_MEDIA_PRESENT</allowedValue>
+      </allowedValueList>
+    </stateVariable>
+    <stateVariable sendEvents="no"><name>A_ARG_TYPE_InstanceID</name><dataType>ui4</dataType></stateVariable>
+"""
+
+
+async def async_setup_akubox(hass: HomeAssistant, **options) -> MockConfigEntry:
+    """Set up an entry for a box at 127.0.0.1 with the given options."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_HOST: "127.0.0.1"},
+        options=options,
+        unique_id="127.0.0.1",
+        title="AkuBox (box1)",
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    return entry
+
+
+class UpnpStandIn:
+    """A minimal DLNA renderer: serves its description and handles SUBSCRIBE, UNSUBSCRIBE and NOTIFY.
+
+    subscription_timeout is what SUBSCRIBE grants; once accept_subscriptions is False every
+    SUBSCRIBE (new or renewal) is rejected, like a renderer that was switched off.
+    """
+
+    def __init__(self) -> None:
+        self.accept_subscriptions = True
+        self.subscription_timeout = 1800
+        self.subscriptions: dict[str, tuple[str, str]] = {}  # SID -> (service, callback URL)
+        self.location = ""
+        self._sids = itertools.count(1)
+        self._seq = itertools.count()
+        self._runner: web.AppRunner | None = None
+
+    async def async_start(self) -> None:
+        app = web.Application()
+        app.router.add_get("/description.xml", self._xml(DESCRIPTION_XML))
+        app.router.add_get("/RenderingControl.xml", self._xml(SCPD_XML.format(variables=RENDERING_CONTROL_VARIABLES)))
+        app.router.add_get("/AVTransport.xml", self._xml(SCPD_XML.format(variables=AV_TRANSPORT_VARIABLES)))
+        app.router.add_route("SUBSCRIBE", "/{service}/event", self._subscribe)
+        app.router.add_route("UNSUBSCRIBE", "/{service}/event", self._unsubscribe)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.location = f"http://127.0.0.1:{port}/description.xml"
+
+    async def async_stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    @staticmethod
+    def _xml(body: str):
+        async def handler(request: web.Request) -> web.Response:
+            return web.Response(text=body, content_type="text/xml")
+
+        return handler
+
+    async def _subscribe(self, request: web.Request) -> web.Response:
+        if not self.accept_subscriptions:
+            return web.Response(status=412 if "SID" in request.headers else 503)
+        if (sid := request.headers.get("SID")) is not None:
+            if sid not in self.subscriptions:
+                return web.Response(status=412)
+        else:
+            sid = f"uuid:sid-{next(self._sids)}"
+            callback = request.headers["CALLBACK"].strip("<>")
+            self.subscriptions[sid] = (request.match_info["service"], callback)
+        return web.Response(headers={"SID": sid, "TIMEOUT": f"Second-{self.subscription_timeout}"})
+
+    async def _unsubscribe(self, request: web.Request) -> web.Response:
+        if self.subscriptions.pop(request.headers.get("SID", ""), None) is None:
+            return web.Response(status=412)
+        return web.Response()
+
+    async def async_notify(self, service: str, last_change: str) -> None:
+        """Send a LastChange event to every subscriber of service."""
+        body = (
+            '<?xml version="1.0"?>'
+            '<e:propertyset xmlns:e="urn:schemas-upnp-org:event-1-0">'
+            f"<e:property><LastChange>{escape(last_change)}</LastChange></e:property>"
+            "</e:propertyset>"
+        )
+        async with ClientSession(connector=TCPConnector(resolver=ThreadedResolver())) as session:
+            for sid, (subscribed_service, callback) in self.subscriptions.items():
+                if subscribed_service != service:
+                    continue
+                headers = {
+                    "NT": "upnp:event",
+                    "NTS": "upnp:propchange",
+                    "SID": sid,
+                    "SEQ": str(next(self._seq)),
+                    "CONTENT-TYPE": 'text/xml; charset="utf-8"',
+                }
+                async with session.request("NOTIFY", callback, headers=headers, data=body) as response:
+                    assert response.status == 200
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Load the integration from custom_components."""
+    yield
+
+
+@pytest.fixture
+async def upnp_stand_in(socket_enabled) -> AsyncIterator[UpnpStandIn]:
+    """Run a local DLNA renderer and point the integration's discovery at it."""
+    stand_in = UpnpStandIn()
+    await stand_in.async_start()
+    with patch(
+        "custom_components.akubox_controller.dlna.AkuBoxDlnaListener._async_find_location",
+        AsyncMock(return_value=stand_in.location),
+    ):
+        yield stand_in
+    await stand_in.async_stop()
+
+
+@pytest.fixture
+def mock_client() -> Iterator[dict[str, AsyncMock]]:
+    """Replace the box's HTTP API with a volume of 20."""
+    mocks = {
+        "get_system_info": AsyncMock(return_value=SYSTEM_INFO),
+        "get_volume": AsyncMock(return_value={"volume": 20}),
+        "get_dlna_state": AsyncMock(return_value=True),
+        "get_led_logo_state": AsyncMock(return_value=False),
+        "set_volume": AsyncMock(return_value={}),
+        "set_dlna_state": AsyncMock(return_value={}),
+        "set_led_logo_state": AsyncMock(return_value={}),
+    }
+    with patch.multiple(CLIENT, **mocks):
+        yield mocks
+
+
+@pytest.fixture
+def no_dlna() -> Iterator[None]:
+    """Leave the volume on polling, as if the box had no DLNA renderer."""
+    with patch(
+        "custom_components.akubox_controller.dlna.AkuBoxDlnaListener.async_start",
+        AsyncMock(return_value=False),
+    ):
+        yield
@@ -0,0 +1,53 @@
+"""Tests for the Home Assistant independent AkuBox API client."""
+import asyncio
+from collections.abc import AsyncIterator
+
+import pytest
+from aiohttp import ClientSession, TCPConnector, ThreadedResolver, web
+
+from custom_components.akubox_controller.akubox_client import AkuBoxApiClient, AkuBoxApiTimeoutError
+from custom_components.akubox_controller.akubox_client.client import TIMEOUT_MIN
+
+
+@pytest.fixture
+async def box(socket_enabled) -> AsyncIterator[tuple[str, dict[str, float]]]:
+    """Serve /api/volume/* with a configurable delay for writes; yields (host, delays)."""
+    delays = {"set": 0.0}
+
+    async def get_volume(request: web.Request) -> web.Response:
+        return web.json_response({"volume": 20})
+
+    async def set_volume(request: web.Request) -> web.Response:
+        await asyncio.sleep(delays["set"])
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_get("/api/volume/get", get_volume)
+    app.router.add_post("/api/volume/set", set_volume)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    yield f"127.0.0.1:{site._server.sockets[0].getsockname()[1]}", delays
+    await runner.cleanup()
+
+
+async def test_writes_get_their_own_timeout(box: tuple[str, dict[str, float]]) -> None:
+    """Fast GETs shrink the read timeout without cutting short slower writes."""
+    host, delays = box
+    async with ClientSession(connector=TCPConnector(resolver=ThreadedResolver())) as session:
+        client = AkuBoxApiClient(host, session, write_timeout=1.5)
+        base_url = f"http://{host}"
+        for _ in range(10):
+            await client.get_volume()
+        assert client.request_timeouts[base_url] == TIMEOUT_MIN
+
+        delays["set"] = 1
+        assert await client.set_volume(30) == {"ok": True}
+
+        delays["set"] = 2
+        with pytest.raises(AkuBoxApiTimeoutError):
+            await client.set_volume(30)
+        # A timed-out write leaves the GET estimate alone
+        assert client.request_timeouts[base_url] == TIMEOUT_MIN
+        assert "retries" not in client.request_stats
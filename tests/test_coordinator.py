@@ -0,0 +1,129 @@
+"""Tests for the AkuBox data update coordinator."""
+from datetime import timedelta
+from unittest.mock import AsyncMock, patch
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_HOST, STATE_ON, STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_capture_events, async_fire_time_changed
+
+from custom_components.akubox_controller.api import AkuBoxApiConnectionError, AkuBoxApiTimeoutError
+from custom_components.akubox_controller.const import (
+    CAP_BATTERY,
+    CAP_VOLUME,
+    DOMAIN,
+    EVENT_CHANGED,
+    SWITCH_DLNA,
+    SWITCH_LED_LOGO,
+)
+
+from .conftest import SYSTEM_INFO, async_setup_akubox
+
+CPU_USAGE = "sensor.akubox_controller_127_0_0_1_cpu_usage"
+VOLUME_CONTROL = "media_player.akubox_box1_volume_control"
+DLNA_SWITCH = "switch.akubox_controller_127_0_0_1_dlna_state_switch"
+
+
+async def test_stale_grace_counts_from_first_failure(hass: HomeAssistant, mock_client, no_dlna) -> None:
+    """Data older than the grace window is still served when polls have only just started failing."""
+    entry = await async_setup_akubox(hass, stale_grace_period=100)
+    coordinator = hass.data[DOMAIN][entry.entry_id]["system_coordinator"]
+    # Last confirmed well before the grace window, e.g. one long poll interval ago
+    coordinator._data_updated_at -= 1000
+
+    mock_client["get_system_info"].side_effect = AkuBoxApiConnectionError("down")
+    await coordinator.async_refresh()
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    state = hass.states.get(CPU_USAGE)
+    assert state.state == "3.2"
+    assert state.attributes["stale"] is True
+
+    # Further failures do not restart the window
+    await coordinator.async_refresh()
+    coordinator._failing_since -= 101
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=101))
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert hass.states.get(CPU_USAGE).state == STATE_UNAVAILABLE
+
+    mock_client["get_system_info"].side_effect = None
+    await coordinator.async_refresh()
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert hass.states.get(CPU_USAGE).state == "3.2"
+    assert coordinator._failing_since is None
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+
+async def test_switch_read_failure_does_not_block_setup(hass: HomeAssistant, mock_client, no_dlna) -> None:
+    """Only the switches are unavailable when port 2268 does not answer at setup."""
+    mock_client["get_dlna_state"].side_effect = AkuBoxApiTimeoutError("timeout")
+    mock_client["get_led_logo_state"].side_effect = AkuBoxApiTimeoutError("timeout")
+    entry = await async_setup_akubox(hass)
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert hass.states.get(DLNA_SWITCH).state == STATE_UNAVAILABLE
+    assert hass.states.get(CPU_USAGE).state == "3.2"
+
+    mock_client["get_dlna_state"].side_effect = None
+    mock_client["get_led_logo_state"].side_effect = None
+    await hass.data[DOMAIN][entry.entry_id]["switch_coordinator"].async_refresh()
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert hass.states.get(DLNA_SWITCH).state == STATE_ON
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+
+async def test_volume_read_failure_does_not_block_setup(hass: HomeAssistant, mock_client, no_dlna) -> None:
+    """Only the media player is unavailable when /api/volume/get fails at setup."""
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_HOST: "127.0.0.1"}, unique_id="127.0.0.1", title="AkuBox (box1)")
+    entry.add_to_hass(hass)
+    # The capability probe already knows the endpoint, so only the first poll fails
+    with patch(
+        "custom_components.akubox_controller.async_get_capabilities",
+        AsyncMock(return_value={CAP_BATTERY: False, CAP_VOLUME: True, SWITCH_DLNA: True, SWITCH_LED_LOGO: True}),
+    ):
+        mock_client["get_volume"].side_effect = AkuBoxApiTimeoutError("timeout")
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert hass.states.get(VOLUME_CONTROL).state == STATE_UNAVAILABLE
+    assert hass.states.get(CPU_USAGE).state == "3.2"
+    assert hass.states.get(DLNA_SWITCH).state == STATE_ON
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+
+async def test_goroutine_changes_use_a_threshold(hass: HomeAssistant, mock_client, no_dlna) -> None:
+    """Goroutine counts are reported once they moved far enough; CPU and memory stay out by default."""
+    entry = await async_setup_akubox(hass, goroutine_change_threshold=50)
+    coordinator = hass.data[DOMAIN][entry.entry_id]["system_coordinator"]
+    events = async_capture_events(hass, EVENT_CHANGED)
+
+    async def async_poll(goroutines: int, cpu_usage: float) -> None:
+        mock_client["get_system_info"].return_value = {
+            **SYSTEM_INFO,
+            "cpu": {**SYSTEM_INFO["cpu"], "usage": cpu_usage},
+            "system": {**SYSTEM_INFO["system"], "num_goroutine": goroutines},
+        }
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    await async_poll(40, 5.0)
+    await async_poll(55, 7.5)
+    assert events == []
+
+    # A slow climb is reported against the last reported value, not the previous poll
+    await async_poll(62, 4.0)
+    assert [event.data["changes"] for event in events] == [{"system.num_goroutine": {"old": 12, "new": 62}}]
+
+    await async_poll(70, 4.0)
+    assert len(events) == 1
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
@@ -0,0 +1,73 @@
+"""Tests for DLNA push updates of the volume media player, against a local UPnP stand-in."""
+import asyncio
+from datetime import timedelta
+
+from homeassistant.const import STATE_IDLE, STATE_PLAYING
+from homeassistant.core import HomeAssistant
+
+from custom_components.akubox_controller.const import DOMAIN, UPDATE_INTERVAL_VOLUME
+
+from .conftest import UpnpStandIn, async_setup_akubox
+
+ENTITY_ID = "media_player.akubox_box1_volume_control"
+
+VOLUME_CHANGE = (
+    '<Event xmlns="urn:schemas-upnp-org:metadata-1-0/RCS/">'
+    '<InstanceID val="0"><Volume channel="Master" val="50"/></InstanceID>'
+    "</Event>"
+)
+PLAYING = (
+    '<Event xmlns="urn:schemas-upnp-org:metadata-1-0/AVT/">'
+    '<InstanceID val="0"><TransportState val="PLAYING"/></InstanceID>'
+    "</Event>"
+)
+
+
+async def test_event_pushes_volume(hass: HomeAssistant, upnp_stand_in: UpnpStandIn, mock_client) -> None:
+    """A subscribed renderer's events replace volume polling."""
+    entry = await async_setup_akubox(hass)
+    coordinator = hass.data[DOMAIN][entry.entry_id]["volume_coordinator"]
+
+    assert {service for service, _ in upnp_stand_in.subscriptions.values()} == {"RenderingControl", "AVTransport"}
+    assert coordinator.update_interval is None
+    assert coordinator.data == {"volume": 20}
+    polls = mock_client["get_volume"].await_count
+
+    await upnp_stand_in.async_notify("RenderingControl", VOLUME_CHANGE)
+    await upnp_stand_in.async_notify("AVTransport", PLAYING)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    # 50 of 100 on the renderer is 32 of 63 on the box's API
+    assert coordinator.data == {"volume": 32}
+    assert mock_client["get_volume"].await_count == polls
+    state = hass.states.get(ENTITY_ID)
+    assert state.state == STATE_PLAYING
+    assert state.attributes["volume_level"] == 32 / 63
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert upnp_stand_in.subscriptions == {}
+
+
+async def test_failed_resubscribe_resumes_polling(hass: HomeAssistant, upnp_stand_in: UpnpStandIn, mock_client) -> None:
+    """Polling takes over again once the renderer stops accepting subscriptions."""
+    # Renewals are due one minute before expiry, i.e. a second after subscribing
+    upnp_stand_in.subscription_timeout = 61
+    entry = await async_setup_akubox(hass)
+    coordinator = hass.data[DOMAIN][entry.entry_id]["volume_coordinator"]
+    assert coordinator.update_interval is None
+    polls = mock_client["get_volume"].await_count
+
+    upnp_stand_in.accept_subscriptions = False
+    async with asyncio.timeout(10):
+        while coordinator.update_interval is None:
+            await asyncio.sleep(0.1)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert coordinator.update_interval == timedelta(seconds=UPDATE_INTERVAL_VOLUME)
+    # Changes missed since the last event are fetched right away
+    assert mock_client["get_volume"].await_count == polls + 1
+    assert hass.states.get(ENTITY_ID).state == STATE_IDLE
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
@@ -0,0 +1,23 @@
+"""Tests for the snapshot and restore services."""
+from homeassistant.core import HomeAssistant
+
+from custom_components.akubox_controller.const import DOMAIN, SERVICE_RESTORE, SERVICE_SNAPSHOT
+
+from .conftest import async_setup_akubox
+
+
+async def test_restore_reads_live_volume(hass: HomeAssistant, mock_client, no_dlna) -> None:
+    """A volume changed by another controller since the last poll is still restored."""
+    entry = await async_setup_akubox(hass)
+    await hass.services.async_call(DOMAIN, SERVICE_SNAPSHOT, {"snapshot_id": "announcement"}, blocking=True)
+
+    # Changed outside Home Assistant; the coordinator still holds 20
+    mock_client["get_volume"].return_value = {"volume": 40}
+    await hass.services.async_call(DOMAIN, SERVICE_RESTORE, {"snapshot_id": "announcement"}, blocking=True)
+
+    mock_client["set_volume"].assert_awaited_once_with(20)
+    mock_client["set_dlna_state"].assert_not_awaited()
+    mock_client["set_led_logo_state"].assert_not_awaited()
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)